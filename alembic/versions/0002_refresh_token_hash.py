@@ -0,0 +1,46 @@
+"""store refresh tokens as indexed sha-256 digests
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("refresh_tokens", sa.Column("token_hash", sa.String(64), nullable=True))
+    # Same digest as app.core.security.hash_token
+    op.execute(
+        "UPDATE refresh_tokens "
+        "SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex')"
+    )
+    # Tokens minted for the same user in the same second used to be identical
+    op.execute(
+        "DELETE FROM refresh_tokens a USING refresh_tokens b "
+        "WHERE a.token_hash = b.token_hash AND a.id < b.id"
+    )
+    op.alter_column("refresh_tokens", "token_hash", nullable=False)
+    op.create_index("ix_refresh_tokens_token_hash", "refresh_tokens", ["token_hash"], unique=True)
+    op.create_index("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"])
+    op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"])
+    op.drop_column("refresh_tokens", "token")
+
+
+def downgrade() -> None:
+    # Digests cannot be reversed, so existing sessions are revoked.
+    op.execute("DELETE FROM refresh_tokens")
+    op.add_column("refresh_tokens", sa.Column("token", sa.String(), nullable=False))
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_user_id", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_token_hash", table_name="refresh_tokens")
+    op.drop_column("refresh_tokens", "token_hash")
@@ -0,0 +1,28 @@
+"""keyset pagination indexes on users
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_created_at_id", "users", ["created_at", "id"])
+    op.create_index("ix_users_role_created_at_id", "users", ["role", "created_at", "id"])
+    op.create_index("ix_users_is_active_created_at_id", "users", ["is_active", "created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_is_active_created_at_id", table_name="users")
+    op.drop_index("ix_users_role_created_at_id", table_name="users")
+    op.drop_index("ix_users_created_at_id", table_name="users")
@@ -0,0 +1,58 @@
+"""email outbox
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:04
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NEXT_ATTEMPT_AT_DEFAULT = sa.text("timezone('utc', now())")
+
+
+def upgrade() -> None:
+    # Earlier drafts of 0001 created this table; only fix its clock there
+    if sa.inspect(op.get_bind()).has_table("email_outbox"):
+        op.alter_column("email_outbox", "next_attempt_at", server_default=NEXT_ATTEMPT_AT_DEFAULT)
+        return
+
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("to_email", sa.String(), nullable=False),
+        sa.Column("subject", sa.String(), nullable=False),
+        sa.Column("html_content", sa.Text(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("pending", "sending", "sent", "failed", name="email_status"),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False, server_default=NEXT_ATTEMPT_AT_DEFAULT),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ix_email_outbox_status_next_attempt_at",
+        "email_outbox",
+        ["status", "next_attempt_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_email_outbox_status_next_attempt_at", table_name="email_outbox")
+    op.drop_table("email_outbox")
+    sa.Enum(name="email_status").drop(op.get_bind(), checkfirst=True)
@@ -1,37 +1,48 @@
 from fastapi import APIRouter, Depends, HTTPException, Response, Request, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.schemas.user import UserCreate
-from app.schemas.auth import LoginSchema, OTPSchema
+from app.schemas.auth import LoginSchema, OTPSchema, ResendOTPSchema, IntrospectRequest, IntrospectResponse
 from app.models.user import User
-from app.services.auth_service import signup, verify_otp, login ,logout_user, logout_all_sessions
-from app.utils.password import verify_password
+from app.services.auth_service import signup, verify_otp, resend_otp, login ,logout_user, logout_all_sessions, introspect_tokens
+from app.utils.password import verify_password_async
 from app.core.config import settings
-from app.dependencies.auth import get_current_user  
+from app.dependencies.auth import get_current_user, introspection_client
+from app.core.rate_limit import rate_limit
 from sqlalchemy import select
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
-def signup_api(data: UserCreate, db: Session = Depends(get_db)):
-    return signup(db, data)
+async def signup_api(request: Request, data: UserCreate, db: AsyncSession = Depends(get_db)):
+    await rate_limit(request, "signup", data.email)
+    return await signup(db, data)
 
 @router.post("/verify-otp")
-def verify_otp_api(data: OTPSchema, db: Session = Depends(get_db)):
-    return verify_otp(db, data.email, data.otp)
+async def verify_otp_api(request: Request, data: OTPSchema, db: AsyncSession = Depends(get_db)):
+    await rate_limit(request, "verify_otp", data.email)
+    return await verify_otp(db, data.email, data.otp)
+
+@router.post("/resend-otp")
+async def resend_otp_api(request: Request, data: ResendOTPSchema, db: AsyncSession = Depends(get_db)):
+    await rate_limit(request, "resend_otp", data.email)
+    return await resend_otp(db, data.email)
 
 @router.post("/login")
 async def login_api(
+    request: Request,
     data: LoginSchema,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    user = db.execute(
+    await rate_limit(request, "login", data.email)
+
+    user = (await db.execute(
         select(User).where(User.email == data.email)
-    ).scalar_one_or_none()
+    )).scalar_one_or_none()
 
-    if not user or not verify_password(data.password, user.password):
+    if not user or not await verify_password_async(data.password, user.password):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
     if not user.is_verified:
@@ -43,7 +54,7 @@ async def login_api(
             detail="Your account was deactivated. Please contact admin."
         )
 
-    access_token, refresh_token = login(db, user)
+    access_token, refresh_token = await login(db, user)
 
     response.set_cookie(
         key=settings.ACCESS_TOKEN_COOKIE_NAME,
@@ -63,25 +74,35 @@ async def login_api(
     return {"message": "Login successful"}
 
 @router.post("/logout")
-def logout(
+async def logout(
     request: Request,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return logout_user(request, response, db)
+    return await logout_user(request, response, db)
 
 @router.post("/logout-all-sessions")
-def logout_all_sessions_api(
+async def logout_all_sessions_api(
     request: Request,
     response: Response,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     user_id = current_user["sub"]
 
-    return logout_all_sessions(
+    return await logout_all_sessions(
         request=request,
         response=response,
         db=db,
         user_id=user_id
-    )
\ No newline at end of file
+    )
+
+@router.post(
+    "/introspect",
+    response_model=IntrospectResponse,
+    dependencies=[Depends(introspection_client)]
+)
+async def introspect_api(data: IntrospectRequest, db: AsyncSession = Depends(get_db)):
+    # Primary, not a replica: a revoked refresh token must not read as
+    # active while replicas catch up
+    return await introspect_tokens(db, data.tokens)
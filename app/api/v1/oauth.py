@@ -1,85 +1,54 @@
+import asyncio
+
+import httpx
 from fastapi import APIRouter, Request, Depends, Response, HTTPException
-from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.oauth import oauth
+from app.core.oauth import get_oauth_client
 from app.core.database import get_db
-from app.models.user import User, Role
-from app.models.refresh_token import RefreshToken
-from app.core.security import create_access_token, create_refresh_token
 from app.core.config import settings
+from app.services.oauth_service import oauth_login
 
 router = APIRouter(prefix="/oauth", tags=["OAuth"])
 
+
+def _set_session_cookies(response: Response, access_token: str, refresh_token: str):
+    response.set_cookie(
+        key=settings.ACCESS_TOKEN_COOKIE_NAME,
+        value=access_token,
+        httponly=True,
+        secure=settings.COOKIE_SECURE,
+        samesite=settings.COOKIE_SAMESITE
+    )
+    response.set_cookie(
+        key=settings.REFRESH_TOKEN_COOKIE_NAME,
+        value=refresh_token,
+        httponly=True,
+        secure=settings.COOKIE_SECURE,
+        samesite=settings.COOKIE_SAMESITE
+    )
+
+
 @router.get("/google/login")
 async def google_login(request: Request):
     redirect_uri = request.url_for("google_callback")
-    return await oauth.google.authorize_redirect(request, redirect_uri)
+    return await get_oauth_client("google").authorize_redirect(request, redirect_uri)
 
 
 @router.get("/google/callback")
 async def google_callback(
     request: Request,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    token = await oauth.google.authorize_access_token(request)
+    token = await get_oauth_client("google").authorize_access_token(request)
     user_info = token["userinfo"]
 
     email = user_info["email"]
     name = user_info.get("name", "Google User")
 
-    user = db.query(User).filter(User.email == email).first()
-
-    if not user:
-        user = User(
-            name=name,
-            email=email,
-            phone="",
-            password="oauth",
-            role=Role.USER,
-            is_verified=True
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-
-    if not user.is_active:
-        raise HTTPException(403, "Account deactivated")
-
-    access_token = create_access_token({
-        "sub": str(user.id),
-        "role": user.role.value
-    })
-
-    refresh_token = create_refresh_token({"sub": str(user.id)})
-
-    db.add(
-        RefreshToken(
-            user_id=user.id,
-            token=refresh_token,
-            expires_at=datetime.utcnow() + timedelta(
-                minutes=settings.REFRESH_TOKEN_EXPIRE_DAYS
-            )
-        )
-    )
-    db.commit()
-
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,
-        secure=True,
-        samesite="strict"
-    )
-
-    response.set_cookie(
-        key="refresh_token",
-        value=refresh_token,
-        httponly=True,
-        secure=True,
-        samesite="strict"
-    )
+    access_token, refresh_token = await oauth_login(db, email, name)
+    _set_session_cookies(response, access_token, refresh_token)
 
     return {"message": "Google login successful"}
 
@@ -87,20 +56,31 @@ async def google_callback(
 @router.get("/github/login")
 async def github_login(request: Request):
     redirect_uri = request.url_for("github_callback")
-    return await oauth.github.authorize_redirect(request, redirect_uri)
+    return await get_oauth_client("github").authorize_redirect(request, redirect_uri)
 
 @router.get("/github/callback")
 async def github_callback(
     request: Request,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    token = await oauth.github.authorize_access_token(request)
+    github = get_oauth_client("github")
+    token = await github.authorize_access_token(request)
 
-    profile_resp = await oauth.github.get("user", token=token)
-    profile = profile_resp.json()
+    try:
+        profile_resp, emails_resp = await asyncio.gather(
+            github.get("user", token=token),
+            github.get("user/emails", token=token)
+        )
+    except httpx.TimeoutException:
+        raise HTTPException(504, "GitHub did not respond in time")
+    except httpx.HTTPError:
+        raise HTTPException(502, "GitHub request failed")
 
-    emails_resp = await oauth.github.get("user/emails", token=token)
+    if profile_resp.is_error or emails_resp.is_error:
+        raise HTTPException(502, "GitHub request failed")
+
+    profile = profile_resp.json()
     emails = emails_resp.json()
 
     primary_email = None
@@ -114,56 +94,7 @@ async def github_callback(
 
     name = profile.get("name") or profile.get("login")
 
-    user = db.query(User).filter(User.email == primary_email).first()
-
-    if not user:
-        user = User(
-            name=name,
-            email=primary_email,
-            phone=None,
-            password="oauth",
-            role=Role.user,
-            is_verified=True,
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-
-    if not user.is_active:
-        raise HTTPException(403, "Account deactivated")
-
-    access_token = create_access_token({
-        "sub": str(user.id),
-        "role": user.role.value
-    })
-
-    refresh_token = create_refresh_token({"sub": str(user.id)})
-
-    db.add(
-        RefreshToken(
-            user_id=user.id,
-            token=refresh_token,
-            expires_at=datetime.utcnow() + timedelta(
-                days=settings.REFRESH_TOKEN_EXPIRE_DAYS
-            )
-        )
-    )
-    db.commit()
-
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,
-        secure=False,
-        samesite="lax"
-    )
-
-    response.set_cookie(
-        key="refresh_token",
-        value=refresh_token,
-        httponly=True,
-        secure=False,
-        samesite="lax"
-    )
+    access_token, refresh_token = await oauth_login(db, primary_email, name)
+    _set_session_cookies(response, access_token, refresh_token)
 
     return {"message": "GitHub login successful"}
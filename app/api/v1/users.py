@@ -1,45 +1,138 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from contextlib import aclosing
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from typing import Literal, Optional
 
 from app.core.database import get_db
-from app.schemas.user import UserOut
+from app.core.replicas import get_read_db
+from app.schemas.user import UserOut, UserPage, Role, BulkStatusUpdate, BulkStatusResult, user_page_adapter
 from app.dependencies.auth import user_required, admin_required
+from app.utils.etag import if_none_match
 from app.services.user_service import (
-    get_my_profile,
+    get_my_profile_json,
     get_all_users,
+    users_page_etag,
     deactivate_user,
-    activate_user
+    activate_user,
+    export_users,
+    bulk_set_active,
+    USERS_PAGE_DEFAULT,
+    USERS_PAGE_MAX
 )
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+# Polling clients keep the body but must revalidate it with If-None-Match
+REVALIDATE = "private, no-cache"
+
 @router.get("/me", response_model=UserOut)
-def read_me(
+async def read_me(
+    request: Request,
     current_user=Depends(user_required),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return get_my_profile(db, current_user["sub"])
+    body, etag = await get_my_profile_json(
+        db,
+        current_user["sub"],
+        if_none_match=lambda etag: if_none_match(request, etag)
+    )
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE}
+    if body is None or if_none_match(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
-@router.get("/all", response_model=list[UserOut])
-def read_all_users(
+@router.get("/all", response_model=UserPage)
+async def read_all_users(
+    request: Request,
+    limit: int = Query(USERS_PAGE_DEFAULT, ge=1, le=USERS_PAGE_MAX),
+    cursor: Optional[str] = None,
+    role: Optional[Role] = None,
+    is_active: Optional[bool] = None,
+    is_verified: Optional[bool] = None,
     current_user=Depends(admin_required),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
+):
+    page_args = dict(
+        limit=limit,
+        cursor=cursor,
+        role=role.value if role else None,
+        is_active=is_active,
+        is_verified=is_verified
+    )
+    etag = await users_page_etag(db, **page_args)
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE}
+    if if_none_match(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    page = await get_all_users(db, **page_args)
+    return Response(
+        content=user_page_adapter.dump_json(page),
+        media_type="application/json",
+        headers=headers
+    )
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+@router.get("/export")
+async def export_users_api(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    role: Optional[Role] = None,
+    is_active: Optional[bool] = None,
+    is_verified: Optional[bool] = None,
+    current_user=Depends(admin_required)
 ):
-    return get_all_users(db)
+    async def body():
+        chunks = export_users(
+            format,
+            role=role.value if role else None,
+            is_active=is_active,
+            is_verified=is_verified
+        )
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                if await request.is_disconnected():
+                    break
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'}
+    )
 
 @router.patch("/deactivate/{user_id}")
-def deactivate_user_api(
+async def deactivate_user_api(
     user_id: UUID,
     current_user=Depends(admin_required),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return deactivate_user(db, user_id)
+    return await deactivate_user(db, user_id)
 
 @router.patch("/activate/{user_id}")
-def activate_user_api(
+async def activate_user_api(
     user_id: UUID,
     current_user=Depends(admin_required),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
+):
+    return await activate_user(db, user_id)
+
+@router.patch("/bulk-status", response_model=BulkStatusResult)
+async def bulk_status_api(
+    data: BulkStatusUpdate,
+    current_user=Depends(admin_required),
+    db: AsyncSession = Depends(get_db)
 ):
-    return activate_user(db, user_id)
+    return await bulk_set_active(
+        db,
+        data.is_active,
+        user_ids=data.user_ids,
+        role=data.filter.role.value if data.filter and data.filter.role else None,
+        is_verified=data.filter.is_verified if data.filter else None,
+        exclude_user_id=UUID(current_user["sub"])
+    )
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from app.core.config import settings
+from app.core.keyring import get_keyring
+from app.utils.etag import make_etag, if_none_match
+
+router = APIRouter(prefix="/.well-known", tags=["Well-known"])
+
+
+@router.get("/jwks.json")
+def jwks(request: Request):
+    keyring = get_keyring()
+    if keyring is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    # The document only changes on deploy, so it is served from the bytes
+    # built when the key ring was loaded.
+    etag = make_etag(keyring.jwks_json.decode())
+    headers = {
+        "Cache-Control": f"public, max-age={settings.JWKS_CACHE_SECONDS}",
+        "ETag": etag,
+    }
+    if if_none_match(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=keyring.jwks_json, media_type="application/json", headers=headers)
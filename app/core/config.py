@@ -1,22 +1,68 @@
 import os
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import Literal
+from typing import Literal, Optional
+
+def to_async_url(url: str) -> str:
+    scheme, _, rest = url.partition("://")
+    return f"postgresql+asyncpg://{rest}" if scheme.startswith("postgres") else url
+
 
 class Settings(BaseSettings):
     APP_NAME: str
     ENV: Literal["development", "production", "staging"]
 
     DATABASE_URL: str
+    # Defaults to DATABASE_URL with the asyncpg driver
+    ASYNC_DATABASE_URL: Optional[str] = None
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    # Connections opened at startup so first requests skip the handshake
+    DB_POOL_PREWARM: int = 5
+
+    # Read replicas (JSON list), used by get_read_db
+    DATABASE_REPLICA_URLS: list[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5
+    REPLICA_HEALTH_CHECK_SECONDS: float = 5
+    # Bounds each health check and the connect when a read session opens
+    REPLICA_CONNECT_TIMEOUT_SECONDS: float = 2
+    # Clients that just wrote read from the primary for this long
+    REPLICA_STICKY_SECONDS: int = 10
+    PRIMARY_STICKY_COOKIE_NAME: str = "db_primary"
+
     SESSION_SECRET_KEY: str
     
     REFRESH_TOKEN_SECRET_KEY: str
     REFRESH_TOKEN_ALGORITHM: str
     REFRESH_TOKEN_EXPIRE_DAYS: int
+    # Concurrent silent refreshes of one token share a result for this long
+    REFRESH_COALESCE_SECONDS: float = 5
 
     ACCESS_TOKEN_SECRET_KEY: str
     ACCESS_TOKEN_ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    # Verified access-token claims cache, 0 disables
+    CLAIMS_CACHE_SIZE: int = 10000
+    CLAIMS_CACHE_TTL_SECONDS: float = 60
+    # Serialized /users/me bodies per process, 0 disables; the TTL bounds
+    # how stale another worker's copy can be after a change
+    PROFILE_CACHE_SIZE: int = 10000
+    PROFILE_CACHE_TTL_SECONDS: float = 30
+
+    # Asymmetric access-token signing, see app/core/keyring.py. Unset keeps
+    # HMAC with ACCESS_TOKEN_SECRET_KEY.
+    JWT_KEYS_DIR: Optional[str] = None
+    JWT_ACTIVE_KID: Optional[str] = None
+    JWT_ASYMMETRIC_ALGORITHM: Literal["RS256", "ES256"] = "RS256"
+    # Accept kid-less HMAC access tokens while switching to the key ring.
+    # Turn it on for the switch-over only, and off again once
+    # ACCESS_TOKEN_EXPIRE_MINUTES have passed: while it is on, anyone holding
+    # ACCESS_TOKEN_SECRET_KEY can still mint tokens.
+    JWT_ACCEPT_LEGACY_HMAC: bool = False
+    JWKS_CACHE_SECONDS: int = 300
+    # Bearer key for POST /auth/introspect, unset disables the endpoint
+    INTROSPECTION_API_KEY: Optional[str] = None
 
     ACCESS_TOKEN_COOKIE_NAME: str
     REFRESH_TOKEN_COOKIE_NAME: str
@@ -26,20 +72,91 @@ class Settings(BaseSettings):
     GITHUB_CLIENT_ID: str
     GITHUB_CLIENT_SECRET: str
 
+    #OUTBOUND OAUTH HTTP
+    OAUTH_HTTP_TIMEOUT_SECONDS: float = 10
+    OAUTH_HTTP_CONNECT_TIMEOUT_SECONDS: float = 3
+    OAUTH_HTTP_MAX_CONNECTIONS: int = 50
+    OAUTH_HTTP_MAX_KEEPALIVE: int = 20
+    OAUTH_HTTP_KEEPALIVE_SECONDS: float = 60
+
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
+    GOOGLE_DISCOVERY_URL: str = "https://accounts.google.com/.well-known/openid-configuration"
+
+    #OIDC DISCOVERY / JWKS CACHE
+    OIDC_CACHE_PATH: Optional[str] = None
+    OIDC_CACHE_DEFAULT_TTL_SECONDS: float = 3600
+    OIDC_CACHE_MIN_TTL_SECONDS: float = 60
+    OIDC_CACHE_MAX_TTL_SECONDS: float = 86400
+    OIDC_FORCED_REFRESH_INTERVAL_SECONDS: float = 60
+    OIDC_REFRESH_CHECK_SECONDS: float = 30
+    OIDC_FETCH_TIMEOUT_SECONDS: float = 5
 
     SMTP_HOST: str
     SMTP_PORT: int
     SMTP_USER: str
     SMTP_PASSWORD: str
     EMAIL_FROM: str
+    SMTP_STARTTLS: bool = True
+    SMTP_TIMEOUT_SECONDS: float = 10
+    SMTP_POOL_SIZE: int = 2
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100
+    SMTP_IDLE_TIMEOUT_SECONDS: float = 60
+
+    #EMAIL OUTBOX
+    EMAIL_OUTBOX_ENABLED: bool = True
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_SECONDS: float = 2
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    EMAIL_OUTBOX_BACKOFF_SECONDS: float = 30
+    EMAIL_OUTBOX_LEASE_SECONDS: float = 120
 
     #ROUTES
     API_V1_PREFIX: str
 
+    #REAPER (expired refresh tokens and OTPs)
+    REAPER_ENABLED: bool = True
+    REAPER_INTERVAL_SECONDS: float = 300
+    REAPER_BATCH_SIZE: int = 1000
+    REAPER_BATCH_PAUSE_SECONDS: float = 0.1
+
+    #OBSERVABILITY
+    METRICS_ENABLED: bool = True
+    LOG_LEVEL: str = "INFO"
+
     #OTP
     OTP_EXPIRE_MINUTES: int
+    OTP_MAX_ATTEMPTS: int = 5
+    # Codes must be visible to every worker, so "redis" is the default;
+    # "memory" is only accepted with ENV=development and a single worker
+    OTP_STORE_BACKEND: Literal["memory", "redis"] = "redis"
+    OTP_STORE_URL: Optional[str] = None
+    OTP_STORE_SHARDS: int = 16
+
+    #RATE LIMITING (login, signup, verify-otp)
+    RATE_LIMIT_ENABLED: bool = True
+    # "memory" limits per worker; "redis" shares buckets across workers
+    RATE_LIMIT_BACKEND: Literal["memory", "redis"] = "memory"
+    RATE_LIMIT_URL: Optional[str] = None
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_IP_PER_MINUTE: float = 30
+    RATE_LIMIT_IP_BURST: int = 10
+    RATE_LIMIT_EMAIL_PER_MINUTE: float = 5
+    RATE_LIMIT_EMAIL_BURST: int = 5
+    # Proxies/load balancers (IPs or CIDRs, e.g. ["10.0.0.0/8"]) whose
+    # X-Forwarded-For is trusted to find the client IP; empty uses the peer
+    TRUSTED_PROXIES: list[str] = []
+
+    #PASSWORD HASHING
+    HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    HASH_POOL_SIZE: int = 4
+    HASH_QUEUE_SIZE: int = 32
+
+    @property
+    def async_database_url(self) -> str:
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        return to_async_url(self.DATABASE_URL)
 
     class Config:
         env_file = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".env")
@@ -1,19 +1,60 @@
+import asyncio
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker , declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import InstrumentedAsyncPool, instrument_engine
 
+logger = get_logger(__name__)
 
-engine = create_engine(settings.DATABASE_URL, echo=True)
+engine = create_engine(settings.DATABASE_URL, echo=settings.DB_ECHO)
 SessionLocal = sessionmaker(bind=engine,autocommit=False,autoflush=False)
 Base = declarative_base()
 
+async_engine = create_async_engine(
+    settings.async_database_url,
+    echo=settings.DB_ECHO,
+    poolclass=InstrumentedAsyncPool if settings.METRICS_ENABLED else AsyncAdaptedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+if settings.METRICS_ENABLED:
+    instrument_engine(async_engine.sync_engine)
 
-def get_db():
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_sync_db():
     db = SessionLocal()
     try:
-        print("Database connection established")
         yield db
     finally:
         db.close()
-        print("Database connection closed")
 
+
+async def prewarm_pool(connections: int = settings.DB_POOL_PREWARM) -> None:
+    connections = min(connections, settings.DB_POOL_SIZE)
+    if connections <= 0:
+        return
+    results = await asyncio.gather(
+        *(async_engine.connect().start() for _ in range(connections)),
+        return_exceptions=True
+    )
+    for conn in results:
+        if isinstance(conn, Exception):
+            logger.warning("connection pool prewarm failed", extra={"error": str(conn)})
+        else:
+            await conn.close()
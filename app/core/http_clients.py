@@ -0,0 +1,65 @@
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import OUTBOUND_HTTP_SECONDS
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """
+    Keep-alive connection pool shared by every client of one provider.
+
+    Authlib builds a short-lived httpx client per call and closes it on exit;
+    closing that client must not tear down the shared pool, so `aclose` is a
+    no-op and the pool is closed once at shutdown via `close`.
+    """
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self._transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=settings.OAUTH_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OAUTH_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.OAUTH_HTTP_KEEPALIVE_SECONDS
+            )
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await self._transport.handle_async_request(request)
+            outcome = str(response.status_code)
+            return response
+        finally:
+            OUTBOUND_HTTP_SECONDS.labels(self.provider, outcome).observe(time.perf_counter() - start)
+
+    async def aclose(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        await self._transport.aclose()
+
+
+_transports: dict[str, SharedTransport] = {}
+
+
+def provider_transport(provider: str) -> SharedTransport:
+    transport = _transports.get(provider)
+    if transport is None:
+        transport = _transports.setdefault(provider, SharedTransport(provider))
+    return transport
+
+
+def provider_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        settings.OAUTH_HTTP_TIMEOUT_SECONDS,
+        connect=settings.OAUTH_HTTP_CONNECT_TIMEOUT_SECONDS
+    )
+
+
+async def close_provider_transports() -> None:
+    for transport in list(_transports.values()):
+        await transport.close()
+    _transports.clear()
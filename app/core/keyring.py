@@ -0,0 +1,119 @@
+"""
+Asymmetric signing keys for access tokens.
+
+Keys live in JWT_KEYS_DIR as PEM files named after their `kid`:
+
+    <kid>.pem       private key, can sign (only JWT_ACTIVE_KID does)
+    <kid>.pub.pem   public key only, verify-only (retired keys)
+
+Rotation: add the new key and deploy, so it is published in the JWKS while
+the old key still signs; once consumers have refreshed their JWKS, switch
+JWT_ACTIVE_KID; drop the old key after the longest access-token lifetime.
+
+Generate a key with:
+
+    python -m app.core.keyring <kid> [--dir keys]
+"""
+import argparse
+import json
+import os
+from functools import lru_cache
+from typing import Optional
+
+from jose import jwk, jwt, JWTError
+from jose.backends.base import Key
+
+from app.core.config import settings
+
+
+class KeyRing:
+    def __init__(self, keys_dir: str, active_kid: str, algorithm: str):
+        self.algorithm = algorithm
+        self.active_kid = active_kid
+        self.signing_key: Optional[Key] = None
+        self.verify_keys: dict[str, Key] = {}
+
+        for filename in sorted(os.listdir(keys_dir)):
+            if not filename.endswith(".pem"):
+                continue
+            path = os.path.join(keys_dir, filename)
+            with open(path) as f:
+                pem = f.read()
+            if filename.endswith(".pub.pem"):
+                kid = filename[:-len(".pub.pem")]
+                self.verify_keys[kid] = jwk.construct(pem, algorithm)
+            else:
+                kid = filename[:-len(".pem")]
+                private_key = jwk.construct(pem, algorithm)
+                self.verify_keys[kid] = private_key.public_key()
+                if kid == active_kid:
+                    self.signing_key = private_key
+
+        if self.signing_key is None:
+            raise RuntimeError(f"No private key for JWT_ACTIVE_KID={active_kid!r} in {keys_dir}")
+
+        self.jwks = {
+            "keys": [
+                {**key.to_dict(), "kid": kid, "use": "sig", "alg": algorithm}
+                for kid, key in self.verify_keys.items()
+            ]
+        }
+        self.jwks_json = json.dumps(self.jwks, separators=(",", ":")).encode()
+
+    def sign(self, claims: dict) -> str:
+        return jwt.encode(
+            claims,
+            self.signing_key,
+            algorithm=self.algorithm,
+            headers={"kid": self.active_kid}
+        )
+
+    def decode(self, token: str) -> dict:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.verify_keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown signing key {kid!r}")
+        return jwt.decode(token, key, algorithms=[self.algorithm])
+
+
+@lru_cache()
+def get_keyring() -> Optional[KeyRing]:
+    """
+    The configured key ring, parsed once per process; None keeps HMAC signing.
+    """
+    if not settings.JWT_KEYS_DIR:
+        return None
+    if not settings.JWT_ACTIVE_KID:
+        raise RuntimeError("JWT_ACTIVE_KID is required when JWT_KEYS_DIR is set")
+    return KeyRing(settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID, settings.JWT_ASYMMETRIC_ALGORITHM)
+
+
+def _generate(kid: str, keys_dir: str, algorithm: str) -> str:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+    if algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    )
+    os.makedirs(keys_dir, exist_ok=True)
+    path = os.path.join(keys_dir, f"{kid}.pem")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a JWT signing key")
+    parser.add_argument("kid")
+    parser.add_argument("--dir", default=settings.JWT_KEYS_DIR or "keys")
+    parser.add_argument("--algorithm", default=settings.JWT_ASYMMETRIC_ALGORITHM, choices=["RS256", "ES256"])
+    args = parser.parse_args()
+    print(_generate(args.kid, args.dir, args.algorithm))
@@ -0,0 +1,188 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+registry = CollectorRegistry(auto_describe=True)
+
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    registry=registry,
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50),
+    registry=registry,
+)
+DB_TIME_PER_REQUEST_SECONDS = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL per HTTP request",
+    ["route"],
+    buckets=FAST_BUCKETS,
+    registry=registry,
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    buckets=FAST_BUCKETS,
+    registry=registry,
+)
+DB_POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time waiting for a pooled DB connection",
+    buckets=FAST_BUCKETS,
+    registry=registry,
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "DB connections currently checked out",
+    registry=registry,
+)
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_capacity",
+    "Maximum DB connections (pool size + overflow)",
+    registry=registry,
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt hash/verify time including pool queueing",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0, 5.0),
+    registry=registry,
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Hash jobs rejected because the hashing queue was full",
+    registry=registry,
+)
+JWT_DECODE_SECONDS = Histogram(
+    "jwt_decode_duration_seconds",
+    "JWT signature verification and decode time",
+    ["token_type"],
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+    registry=registry,
+)
+SMTP_SEND_SECONDS = Histogram(
+    "smtp_send_duration_seconds",
+    "Time to hand one message to the SMTP server",
+    ["outcome"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    registry=registry,
+)
+OUTBOUND_HTTP_SECONDS = Histogram(
+    "outbound_http_duration_seconds",
+    "Latency of calls to OAuth providers",
+    ["provider", "status"],
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    registry=registry,
+)
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_decisions_total",
+    "Rate limiter decisions on auth endpoints",
+    ["scope", "dimension", "outcome"],
+    registry=registry,
+)
+RATE_LIMIT_BUCKETS = Gauge(
+    "rate_limit_buckets",
+    "Token buckets tracked by the in-process rate limiter",
+    registry=registry,
+)
+REAPER_DELETED = Counter(
+    "reaper_deleted_total",
+    "Expired rows/entries removed by the reaper",
+    ["kind"],
+    registry=registry,
+)
+
+PROFILE_CACHE_LOOKUPS = Counter(
+    "profile_cache_lookups_total",
+    "/users/me profile cache lookups",
+    ["result"],
+    registry=registry,
+)
+PROFILE_CACHE_ENTRIES = Gauge(
+    "profile_cache_entries",
+    "Serialized profiles held by the /users/me cache",
+    registry=registry,
+)
+
+# [query count, query seconds] for the request being served
+_request_db_stats: ContextVar[Optional[list]] = ContextVar("request_db_stats", default=None)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waited for a connection.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT_SECONDS.observe(time.perf_counter() - start)
+
+
+def instrument_engine(engine: Engine, pool_metrics: bool = True) -> None:
+    pool = engine.pool
+    if pool_metrics:
+        if hasattr(pool, "size"):
+            DB_POOL_CAPACITY.set(pool.size() + max(pool._max_overflow, 0))
+        DB_POOL_CHECKED_OUT.set_function(
+            lambda: pool.checkedout() if hasattr(pool, "checkedout") else 0
+        )
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+        DB_QUERY_SECONDS.observe(elapsed)
+        stats = _request_db_stats.get()
+        if stats is not None:
+            stats[0] += 1
+            stats[1] += elapsed
+
+
+async def metrics_middleware(request: Request, call_next):
+    stats = [0, 0.0]
+    token = _request_db_stats.set(stats)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        HTTP_REQUEST_SECONDS.labels(request.method, path, str(status)).observe(
+            time.perf_counter() - start
+        )
+        DB_QUERIES_PER_REQUEST.labels(path).observe(stats[0])
+        DB_TIME_PER_REQUEST_SECONDS.labels(path).observe(stats[1])
+        _request_db_stats.reset(token)
+
+
+def metrics_endpoint() -> Response:
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
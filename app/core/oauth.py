@@ -1,29 +1,47 @@
+import threading
+
 from authlib.integrations.starlette_client import OAuth
 from app.core.config import settings
+from app.core.oidc_cache import CachedOIDCApp
+from app.core.http_clients import provider_transport, provider_timeout
 
 oauth = OAuth()
 
-# Google
-oauth.register(
-    name="google",
-    client_id=settings.GOOGLE_CLIENT_ID,
-    client_secret=settings.GOOGLE_CLIENT_SECRET,
-    server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
-    client_kwargs={
-        "scope": "openid email profile"
-    },
-)
+# Clients are registered on first use so importing the app stays cheap
+_CLIENT_CONFIGS = {
+    "google": lambda: dict(
+        client_id=settings.GOOGLE_CLIENT_ID,
+        client_secret=settings.GOOGLE_CLIENT_SECRET,
+        server_metadata_url=settings.GOOGLE_DISCOVERY_URL,
+        client_cls=CachedOIDCApp,
+        client_kwargs={
+            "scope": "openid email profile",
+            "transport": provider_transport("google"),
+            "timeout": provider_timeout(),
+        },
+    ),
+    "github": lambda: dict(
+        client_id=settings.GITHUB_CLIENT_ID,
+        client_secret=settings.GITHUB_CLIENT_SECRET,
+        access_token_url="https://github.com/login/oauth/access_token",
+        authorize_url="https://github.com/login/oauth/authorize",
+        api_base_url="https://api.github.com/",
+        client_kwargs={
+            "scope": "read:user user:email",
+            "transport": provider_transport("github"),
+            "timeout": provider_timeout(),
+        },
+    ),
+}
+_register_lock = threading.Lock()
 
-# GitHub
-oauth.register(
-    name="github",
-    client_id=settings.GITHUB_CLIENT_ID,
-    client_secret=settings.GITHUB_CLIENT_SECRET,
-    access_token_url="https://github.com/login/oauth/access_token",
-    authorize_url="https://github.com/login/oauth/authorize",
-    api_base_url="https://api.github.com/",
-    client_kwargs={
-        "scope": "read:user user:email"
-    },
-)
 
+def get_oauth_client(name: str):
+    client = oauth.create_client(name)
+    if client is None:
+        with _register_lock:
+            client = oauth.create_client(name)
+            if client is None:
+                oauth.register(name=name, **_CLIENT_CONFIGS[name]())
+                client = oauth.create_client(name)
+    return client
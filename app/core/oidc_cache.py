@@ -0,0 +1,171 @@
+import asyncio
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Optional
+
+import httpx
+from authlib.integrations.starlette_client import StarletteOAuth2App
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.single_flight import SingleFlight
+
+logger = get_logger(__name__)
+
+MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+def _ttl_from_headers(headers: httpx.Headers) -> float:
+    cache_control = headers.get("cache-control", "").lower()
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        ttl = 0.0
+    else:
+        match = MAX_AGE_PATTERN.search(cache_control)
+        ttl = float(match.group(1)) if match else settings.OIDC_CACHE_DEFAULT_TTL_SECONDS
+    return min(max(ttl, settings.OIDC_CACHE_MIN_TTL_SECONDS), settings.OIDC_CACHE_MAX_TTL_SECONDS)
+
+
+class OIDCDocumentCache:
+    """
+    Process-wide cache for OIDC discovery documents and JWKS.
+
+    Honours Cache-Control max-age (clamped to the configured bounds),
+    refreshes entries in the background before they expire, serves the
+    stale copy if a refresh fails, and optionally persists to disk so new
+    workers start warm.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._entries: dict[str, dict] = {}
+        self._fetches = SingleFlight(window=1)
+        self._forced_at: dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._tracked: set[str] = set()
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                self._entries.update(json.load(f))
+        except (OSError, ValueError):
+            logger.warning("could not read OIDC cache file", extra={"path": self.path})
+
+    def _persist(self) -> None:
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".oidc-cache-")
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            logger.warning("could not write OIDC cache file", extra={"path": self.path})
+
+    async def _fetch(self, url: str) -> dict:
+        try:
+            async with httpx.AsyncClient(timeout=settings.OIDC_FETCH_TIMEOUT_SECONDS) as client:
+                response = await client.get(url)
+                response.raise_for_status()
+        except httpx.HTTPError:
+            stale = self._entries.get(url)
+            if stale is None:
+                raise
+            logger.warning("OIDC document refresh failed, serving stale copy", extra={"url": url})
+            stale["expires_at"] = time.time() + settings.OIDC_CACHE_MIN_TTL_SECONDS
+            return stale["data"]
+
+        now = time.time()
+        data = response.json()
+        self._entries[url] = {
+            "data": data,
+            "fetched_at": now,
+            "expires_at": now + _ttl_from_headers(response.headers),
+        }
+        if isinstance(data, dict) and data.get("jwks_uri"):
+            self._tracked.add(data["jwks_uri"])
+        self._persist()
+        return data
+
+    async def get(self, url: str, force: bool = False) -> dict:
+        self._tracked.add(url)
+        entry = self._entries.get(url)
+        if force:
+            # Unknown-kid refreshes are rate limited so bogus tokens cannot
+            # turn into a request per login against the provider.
+            last = self._forced_at.get(url, 0)
+            if time.time() - last < settings.OIDC_FORCED_REFRESH_INTERVAL_SECONDS and entry:
+                return entry["data"]
+            self._forced_at[url] = time.time()
+            self._fetches.forget(url)
+        elif entry and entry["expires_at"] > time.time():
+            return entry["data"]
+        return await self._fetches.do(url, lambda: self._fetch(url))
+
+    async def refresh_expiring(self) -> None:
+        seen: set[str] = set()
+        # Repeat so a jwks_uri discovered during this pass is fetched too
+        while pending := (self._tracked | set(self._entries)) - seen:
+            for url in pending:
+                seen.add(url)
+                entry = self._entries.get(url)
+                if entry is not None:
+                    ttl = entry["expires_at"] - entry["fetched_at"]
+                    if entry["expires_at"] - time.time() > ttl * 0.2:
+                        continue
+                try:
+                    await self._fetches.do(url, lambda: self._fetch(url))
+                except Exception:
+                    logger.warning("OIDC document prefetch failed", extra={"url": url})
+
+    def start(self, urls: list[str]) -> None:
+        self.load()
+        self._tracked.update(urls)
+        for entry in self._entries.values():
+            if isinstance(entry["data"], dict) and entry["data"].get("jwks_uri"):
+                self._tracked.add(entry["data"]["jwks_uri"])
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh_expiring()
+            await asyncio.sleep(settings.OIDC_REFRESH_CHECK_SECONDS)
+
+
+oidc_cache = OIDCDocumentCache(settings.OIDC_CACHE_PATH)
+
+
+class CachedOIDCApp(StarletteOAuth2App):
+    """
+    OAuth2/OIDC client that reads discovery metadata and JWKS through
+    `oidc_cache` instead of fetching them per client instance.
+    """
+
+    async def load_server_metadata(self):
+        if self._server_metadata_url:
+            metadata = await oidc_cache.get(self._server_metadata_url)
+            self.server_metadata.update(metadata)
+            self.server_metadata["_loaded_at"] = time.time()
+        return self.server_metadata
+
+    async def fetch_jwk_set(self, force=False):
+        metadata = await self.load_server_metadata()
+        jwks_uri = metadata.get("jwks_uri")
+        if not jwks_uri:
+            raise RuntimeError('Missing "jwks_uri" in metadata')
+        return await oidc_cache.get(jwks_uri, force=force)
@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from app.core.config import settings
+from app.core.metrics import PROFILE_CACHE_LOOKUPS, PROFILE_CACHE_ENTRIES
+
+
+class ProfileFill(NamedTuple):
+    """
+    Handed out by `ProfileCache.get` on a miss and passed back to `put`.
+    """
+    version: int
+    started_at: float
+    # The profile changed within `primary_window`; load it from the primary
+    use_primary: bool
+
+
+class ProfileCache:
+    """
+    Bounded LRU of serialized `/users/me` bodies and their ETags, keyed by
+    user id.
+
+    Writers call `invalidate` after committing. Each invalidated key gets a
+    new version for `primary_window` seconds: a load that started before
+    the invalidation is not stored, and loads in that window should read
+    the primary so a lagging replica cannot put the old row back. The
+    cache is per process, so other workers only see a change when their
+    copy expires after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, primary_window: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.primary_window = primary_window
+        self._entries: "OrderedDict[str, tuple[float, tuple[bytes, str]]]" = OrderedDict()
+        # user id -> (version, invalidated_at), oldest first
+        self._invalidations: "OrderedDict[str, tuple[int, float]]" = OrderedDict()
+        self._version = 0
+        self._lock = threading.Lock()
+        PROFILE_CACHE_ENTRIES.set_function(lambda: len(self._entries))
+
+    def _prune_invalidations(self, now: float) -> None:
+        while self._invalidations:
+            _, invalidated_at = next(iter(self._invalidations.values()))
+            if now - invalidated_at < self.primary_window:
+                break
+            self._invalidations.popitem(last=False)
+
+    def get(self, user_id) -> tuple[Optional[tuple[bytes, str]], ProfileFill]:
+        key = str(user_id)
+        now = time.monotonic()
+        with self._lock:
+            self._prune_invalidations(now)
+            invalidation = self._invalidations.get(key)
+            fill = ProfileFill(
+                version=invalidation[0] if invalidation else 0,
+                started_at=now,
+                use_primary=invalidation is not None
+            )
+            entry = self._entries.get(key) if self.maxsize > 0 else None
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                PROFILE_CACHE_LOOKUPS.labels("miss").inc()
+                return None, fill
+            self._entries.move_to_end(key)
+        PROFILE_CACHE_LOOKUPS.labels("hit").inc()
+        return entry[1], fill
+
+    def put(self, user_id, profile: tuple[bytes, str], fill: ProfileFill) -> None:
+        if self.maxsize <= 0:
+            return
+        key = str(user_id)
+        now = time.monotonic()
+        with self._lock:
+            # Past the window an invalidation record may already be pruned,
+            # so the version check alone can no longer be trusted
+            if now - fill.started_at >= self.primary_window:
+                return
+            invalidation = self._invalidations.get(key)
+            if (invalidation[0] if invalidation else 0) != fill.version:
+                return
+            self._entries[key] = (time.time() + self.ttl, profile)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._prune_invalidations(now)
+            for user_id in user_ids:
+                key = str(user_id)
+                self._version += 1
+                self._entries.pop(key, None)
+                self._invalidations[key] = (self._version, now)
+                self._invalidations.move_to_end(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+profile_cache = ProfileCache(
+    maxsize=settings.PROFILE_CACHE_SIZE,
+    ttl=settings.PROFILE_CACHE_TTL_SECONDS,
+    primary_window=max(settings.REPLICA_STICKY_SECONDS, 1)
+)
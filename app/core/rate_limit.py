@@ -0,0 +1,176 @@
+import ipaddress
+import math
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.metrics import RATE_LIMIT_DECISIONS, RATE_LIMIT_BUCKETS
+
+
+class TokenBucketLimiter(ABC):
+    @abstractmethod
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        """
+        Take one token from `key`'s bucket, refilled at `rate` tokens per
+        second up to `burst`. Returns 0 when allowed, otherwise the seconds
+        until a token is available.
+        """
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryTokenBucketLimiter(TokenBucketLimiter):
+    """
+    In-process buckets, sharded into bounded LRUs.
+
+    Buckets are only touched from the event loop thread, so no locking is
+    needed; sharding keeps each eviction cheap.
+    """
+
+    def __init__(self, shards: int = 16, max_keys: int = 100_000):
+        self._shards = [OrderedDict() for _ in range(max(shards, 1))]
+        self._max_per_shard = max(max_keys // len(self._shards), 1)
+        RATE_LIMIT_BUCKETS.set_function(lambda: sum(len(shard) for shard in self._shards))
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        shard = self._shards[zlib.crc32(key.encode()) % len(self._shards)]
+        now = time.monotonic()
+
+        bucket = shard.get(key)
+        if bucket is None:
+            bucket = shard[key] = [float(burst), now]
+            if len(shard) > self._max_per_shard:
+                shard.popitem(last=False)
+        else:
+            shard.move_to_end(key)
+
+        tokens = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / rate
+
+
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local retry = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(retry)
+"""
+
+
+class RedisTokenBucketLimiter(TokenBucketLimiter):
+    """
+    Buckets shared by every worker through a Redis-protocol server.
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        from redis.asyncio import Redis
+
+        self.prefix = prefix
+        self._redis = Redis.from_url(url, decode_responses=True)
+        self._script = self._redis.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        retry = await self._script(keys=[self.prefix + key], args=[rate, burst])
+        return float(retry)
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def _create_limiter() -> TokenBucketLimiter:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        if not settings.RATE_LIMIT_URL:
+            raise RuntimeError("RATE_LIMIT_URL is required for the redis rate limiter")
+        return RedisTokenBucketLimiter(settings.RATE_LIMIT_URL)
+    return MemoryTokenBucketLimiter(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+limiter = _create_limiter()
+
+
+_trusted_proxies = [ipaddress.ip_network(proxy, strict=False) for proxy in settings.TRUSTED_PROXIES]
+
+
+def _is_trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_proxies)
+
+
+def client_ip(request: Request) -> str:
+    """
+    The address of whoever connected to the first proxy we trust.
+
+    X-Forwarded-For is walked right to left, skipping trusted proxies; the
+    first other entry was appended by a trusted hop and cannot be forged
+    by the client. Without a trusted peer the header is ignored.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted(peer):
+        return peer
+
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+async def rate_limit(request: Request, scope: str, email: Optional[str] = None) -> None:
+    """
+    Charge one request to the client-IP and target-email buckets of `scope`.
+
+    Call first thing in a handler, before any DB or bcrypt work.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
+    checks = [(
+        "ip",
+        client_ip(request),
+        settings.RATE_LIMIT_IP_PER_MINUTE,
+        settings.RATE_LIMIT_IP_BURST
+    )]
+    if email:
+        checks.append((
+            "email",
+            email.lower(),
+            settings.RATE_LIMIT_EMAIL_PER_MINUTE,
+            settings.RATE_LIMIT_EMAIL_BURST
+        ))
+
+    for dimension, value, per_minute, burst in checks:
+        retry_after = await limiter.acquire(f"{scope}:{dimension}:{value}", per_minute / 60, burst)
+        if retry_after > 0:
+            RATE_LIMIT_DECISIONS.labels(scope, dimension, "rejected").inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please try again later.",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+        RATE_LIMIT_DECISIONS.labels(scope, dimension, "allowed").inc()
@@ -0,0 +1,170 @@
+import asyncio
+import itertools
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings, to_async_url
+from app.core.database import AsyncSessionLocal
+from app.core.logging import get_logger
+from app.core.metrics import instrument_engine
+
+logger = get_logger(__name__)
+
+# Seconds of replay lag; 0 when the replica has replayed everything it received
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+# Set per request by read_your_writes_middleware; flipped on primary commit
+_request_writes: ContextVar[Optional[dict]] = ContextVar("request_writes", default=None)
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_request_write(session: Session) -> None:
+    writes = _request_writes.get()
+    if writes is not None and session.info.get("primary", True):
+        writes["committed"] = True
+
+
+class _Replica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine: AsyncEngine = create_async_engine(
+            to_async_url(url),
+            echo=settings.DB_ECHO,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_pre_ping=True
+        )
+        self.sessionmaker = async_sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+            info={"primary": False}
+        )
+        self.healthy = True
+        if settings.METRICS_ENABLED:
+            instrument_engine(self.engine.sync_engine, pool_metrics=False)
+
+
+class ReplicaRouter:
+    """
+    Round-robins read sessions over healthy replicas.
+
+    A background check marks replicas down when unreachable or lagging more
+    than REPLICA_MAX_LAG_SECONDS; with none healthy, reads use the primary.
+    A replica that fails to connect between checks is marked down at once.
+    """
+
+    def __init__(self, urls: list[str]):
+        self.replicas = [_Replica(url) for url in urls]
+        self._next = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    async def session(self) -> AsyncSession:
+        """
+        A read session on the next healthy replica, already connected, or on
+        the primary if there is none or the chosen replica cannot be reached.
+        """
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return AsyncSessionLocal()
+        replica = healthy[next(self._next) % len(healthy)]
+        session = replica.sessionmaker()
+        try:
+            await asyncio.wait_for(session.connection(), settings.REPLICA_CONNECT_TIMEOUT_SECONDS)
+        except Exception:
+            await session.close()
+            self._set_health(replica, False, None)
+            return AsyncSessionLocal()
+        return session
+
+    async def _lag(self, replica: _Replica) -> float:
+        async with replica.engine.connect() as conn:
+            return float((await conn.execute(REPLICA_LAG_SQL)).scalar() or 0)
+
+    async def _check_one(self, replica: _Replica) -> None:
+        try:
+            lag = await asyncio.wait_for(self._lag(replica), settings.REPLICA_CONNECT_TIMEOUT_SECONDS)
+            healthy = lag <= settings.REPLICA_MAX_LAG_SECONDS
+        except Exception:
+            lag, healthy = None, False
+        self._set_health(replica, healthy, lag)
+
+    def _set_health(self, replica: _Replica, healthy: bool, lag: Optional[float]) -> None:
+        if healthy != replica.healthy:
+            logger.warning(
+                "replica health changed",
+                extra={"replica": replica.engine.url.host, "healthy": healthy, "lag": lag}
+            )
+        replica.healthy = healthy
+
+    async def check(self) -> None:
+        # Concurrently, so one hung replica cannot hold up the others
+        await asyncio.gather(*(self._check_one(replica) for replica in self.replicas))
+
+    def start(self) -> None:
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_SECONDS)
+
+
+replica_router = ReplicaRouter(settings.DATABASE_REPLICA_URLS)
+
+
+async def get_read_db(request: Request):
+    """
+    Session for read-only work: a replica unless this client wrote recently.
+    """
+    if request.cookies.get(settings.PRIMARY_STICKY_COOKIE_NAME):
+        session = AsyncSessionLocal()
+    else:
+        session = await replica_router.session()
+
+    async with session as db:
+        yield db
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """
+    Pin the client to the primary for REPLICA_STICKY_SECONDS after a write.
+    """
+    writes = {"committed": False}
+    token = _request_writes.set(writes)
+    try:
+        response = await call_next(request)
+    finally:
+        _request_writes.reset(token)
+
+    if writes["committed"]:
+        response.set_cookie(
+            key=settings.PRIMARY_STICKY_COOKIE_NAME,
+            value="1",
+            max_age=settings.REPLICA_STICKY_SECONDS,
+            httponly=True,
+            secure=settings.COOKIE_SECURE,
+            samesite=settings.COOKIE_SAMESITE
+        )
+    return response
@@ -1,16 +1,40 @@
+import hashlib
+import uuid
 from datetime import datetime ,timedelta
 from jose import jwt
 from app.core.config import settings
+from app.core.keyring import get_keyring
 
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
+    keyring = get_keyring()
+    if keyring is not None:
+        return keyring.sign(to_encode)
     return jwt.encode(to_encode, settings.ACCESS_TOKEN_SECRET_KEY, algorithm=settings.ACCESS_TOKEN_ALGORITHM)
 
 
+def decode_access_token(token: str) -> dict:
+    """
+    Verify an access token against the key ring, or the shared HMAC secret
+    when no key ring is configured. Raises JWTError.
+    """
+    keyring = get_keyring()
+    if keyring is None:
+        return jwt.decode(token, settings.ACCESS_TOKEN_SECRET_KEY, algorithms=[settings.ACCESS_TOKEN_ALGORITHM])
+    if settings.JWT_ACCEPT_LEGACY_HMAC and "kid" not in jwt.get_unverified_header(token):
+        return jwt.decode(token, settings.ACCESS_TOKEN_SECRET_KEY, algorithms=[settings.ACCESS_TOKEN_ALGORITHM])
+    return keyring.decode(token)
+
+
 def create_refresh_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.REFRESH_TOKEN_SECRET_KEY, algorithm=settings.REFRESH_TOKEN_ALGORITHM)
\ No newline at end of file
+    # jti keeps token_hash unique for logins within the same second
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
+    return jwt.encode(to_encode, settings.REFRESH_TOKEN_SECRET_KEY, algorithm=settings.REFRESH_TOKEN_ALGORITHM)
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -1,27 +1,32 @@
+import hmac
+
 from fastapi import Request, HTTPException, Depends
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 from datetime import datetime
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal
 from app.models.refresh_token import RefreshToken
-from app.core.security import create_access_token
+from app.core.security import create_access_token, decode_access_token, hash_token
+from app.core.claims_cache import access_claims_cache
+from app.core.single_flight import SingleFlight
+from app.core.metrics import JWT_DECODE_SECONDS
+
+refresh_single_flight = SingleFlight(window=settings.REFRESH_COALESCE_SECONDS)
 
 
-def get_current_user(
-    request: Request,
-    db: Session = Depends(get_db)
-):
+async def get_current_user(request: Request):
     access_token = request.cookies.get(settings.ACCESS_TOKEN_COOKIE_NAME)
 
     if access_token:
+        payload = access_claims_cache.get(access_token)
+        if payload is not None:
+            return payload
         try:
-            payload = jwt.decode(
-                access_token,
-                settings.ACCESS_TOKEN_SECRET_KEY,
-                algorithms=[settings.ACCESS_TOKEN_ALGORITHM]
-            )
+            with JWT_DECODE_SECONDS.labels("access").time():
+                payload = decode_access_token(access_token)
+            access_claims_cache.put(access_token, payload)
             return payload
         except JWTError:
             pass
@@ -34,10 +39,26 @@ def get_current_user(
             detail="Session expired. Please login again."
         )
 
-    db_token = db.query(RefreshToken).filter(
-        RefreshToken.token == refresh_token,
-        RefreshToken.expires_at > datetime.utcnow()
-    ).first()
+    payload, new_access = await refresh_single_flight.do(
+        hash_token(refresh_token),
+        lambda: _refresh_access_token(refresh_token)
+    )
+
+    request.state.new_access_token = new_access
+    return payload
+
+
+async def _refresh_access_token(refresh_token: str):
+    # Shared by every coalesced caller, so it owns its session instead of
+    # borrowing one from whichever request happened to start it. The
+    # primary is used so a just-revoked token is never accepted.
+    async with AsyncSessionLocal() as db:
+        db_token = (await db.execute(
+            select(RefreshToken.id).where(
+                RefreshToken.token_hash == hash_token(refresh_token),
+                RefreshToken.expires_at > datetime.utcnow()
+            ).limit(1)
+        )).scalar_one_or_none()
 
     if not db_token:
         raise HTTPException(
@@ -45,19 +66,25 @@ def get_current_user(
             detail="Invalid refresh token. Please login again."
         )
 
-    payload = jwt.decode(
-        refresh_token,
-        settings.REFRESH_TOKEN_SECRET_KEY,
-        algorithms=[settings.REFRESH_TOKEN_ALGORITHM]
-    )
+    try:
+        with JWT_DECODE_SECONDS.labels("refresh").time():
+            payload = jwt.decode(
+                refresh_token,
+                settings.REFRESH_TOKEN_SECRET_KEY,
+                algorithms=[settings.REFRESH_TOKEN_ALGORITHM]
+            )
+    except JWTError:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid refresh token. Please login again."
+        )
 
     new_access = create_access_token({
         "sub": payload["sub"],
         "role": payload.get("role", "user")
     })
 
-    request.state.new_access_token = new_access
-    return payload
+    return payload, new_access
 
 def user_required(current_user=Depends(get_current_user)):
     return current_user
@@ -66,4 +93,15 @@ def admin_required(current_user=Depends(get_current_user)):
     if current_user.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
-    
+
+
+def introspection_client(request: Request):
+    """
+    Gateways authenticate with `Authorization: Bearer <INTROSPECTION_API_KEY>`.
+    """
+    if not settings.INTROSPECTION_API_KEY:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, key = request.headers.get("authorization", "").partition(" ")
+    # compare_digest only takes ASCII str, so compare the encoded bytes
+    if scheme.lower() != "bearer" or not hmac.compare_digest(key.encode(), settings.INTROSPECTION_API_KEY.encode()):
+        raise HTTPException(status_code=401, detail="Invalid introspection key")
@@ -1,15 +1,56 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from starlette.middleware.sessions import SessionMiddleware
 
-from app.core.database import engine, Base
+from app.core.database import async_engine, prewarm_pool
+from app.api import well_known
 from app.api.v1 import auth, oauth, users
 from app.core.config import settings
 from app.middlewares.token_refresh import token_refresh_middleware
+from app.utils.password import shutdown_hash_executor
+from app.services.email_dispatcher import email_dispatcher
+from app.core.logging import configure_logging
+from app.core.metrics import metrics_middleware, metrics_endpoint
+from app.core.replicas import replica_router, read_your_writes_middleware
+from app.core.oidc_cache import oidc_cache
+from app.core.http_clients import close_provider_transports
+from app.services.otp_store import otp_store
+from app.core.rate_limit import limiter
+from app.services.reaper import reaper
+from app.core.keyring import get_keyring
 
-Base.metadata.create_all(bind=engine)
+configure_logging(settings.LOG_LEVEL)
 
-app = FastAPI(title=settings.APP_NAME)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema is managed by Alembic (`alembic upgrade head`), not at startup
+    await prewarm_pool()
+    # Parse signing keys now so a bad key directory fails the deploy
+    get_keyring()
+    if settings.EMAIL_OUTBOX_ENABLED:
+        email_dispatcher.start()
+    replica_router.start()
+    oidc_cache.start([settings.GOOGLE_DISCOVERY_URL])
+    if settings.REAPER_ENABLED:
+        reaper.start()
+    yield
+    await reaper.stop()
+    await oidc_cache.stop()
+    await close_provider_transports()
+    await otp_store.close()
+    await limiter.close()
+    await replica_router.stop()
+    await email_dispatcher.stop()
+    shutdown_hash_executor()
+    await async_engine.dispose()
+
+
+app = FastAPI(
+    title=settings.APP_NAME,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 app.add_middleware(
     SessionMiddleware,
@@ -21,9 +62,17 @@ app.add_middleware(
 
 app.middleware("http")(token_refresh_middleware)
 
+if settings.DATABASE_REPLICA_URLS:
+    app.middleware("http")(read_your_writes_middleware)
+
+if settings.METRICS_ENABLED:
+    app.middleware("http")(metrics_middleware)
+    app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
+
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
 app.include_router(oauth.router, prefix=settings.API_V1_PREFIX)
 app.include_router(users.router, prefix=settings.API_V1_PREFIX)
+app.include_router(well_known.router)
 
 @app.get("/")
 def root():
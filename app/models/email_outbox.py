@@ -0,0 +1,44 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+from sqlalchemy import Column, String, Text, Integer, DateTime, Index, func, text, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class EmailStatus(str, Enum):
+    pending = "pending"
+    sending = "sending"
+    sent = "sent"
+    failed = "failed"
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    html_content = Column(Text, nullable=False)
+
+    status = Column(
+        SQLEnum(EmailStatus, name="email_status"),
+        nullable=False,
+        default=EmailStatus.pending
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    # Compared against datetime.utcnow() by the dispatcher, so both defaults are UTC
+    next_attempt_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        server_default=text("timezone('utc', now())")
+    )
+    last_error = Column(Text, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
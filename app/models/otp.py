@@ -1,14 +0,0 @@
-from sqlalchemy import Column, String, DateTime
-from sqlalchemy.dialects.postgresql import UUID
-from app.core.database import Base
-from datetime import datetime
-import uuid
-
-class OTP(Base):
-    __tablename__ = "otps"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    email = Column(String, index=True)
-    otp = Column(String)
-    expires_at = Column(DateTime)
-
-    created_at = Column(DateTime, default=datetime.now())
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Boolean, DateTime, func ,Enum as SQLEnum
+from sqlalchemy import Column, String, Boolean, DateTime, Index, func ,Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from app.core.database import Base
 from enum import Enum
@@ -11,6 +11,12 @@ class Role(str, Enum):
 
 class User(Base):
     __tablename__ = "users"
+    # Keyset pagination on (created_at, id), optionally narrowed by filter
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_role_created_at_id", "role", "created_at", "id"),
+        Index("ix_users_is_active_created_at_id", "is_active", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
@@ -1,12 +1,30 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+from typing import Literal, Optional
 
 class LoginSchema(BaseModel):
     email: EmailStr
     password: str
 
+class ResendOTPSchema(BaseModel):
+    email: EmailStr
+
 class OTPSchema(BaseModel):
     email: EmailStr
-    otp: str
+    # [0-9], not \d: the pattern engine's \d also matches non-ASCII digits
+    otp: str = Field(pattern=r"^[0-9]{6}$")
 
     class config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class IntrospectRequest(BaseModel):
+    tokens: list[str] = Field(min_length=1, max_length=1000)
+
+
+class TokenIntrospection(BaseModel):
+    active: bool
+    token_type: Optional[Literal["access", "refresh"]] = None
+    claims: Optional[dict] = None
+
+
+class IntrospectResponse(BaseModel):
+    results: list[TokenIntrospection]
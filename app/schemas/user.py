@@ -1,6 +1,8 @@
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter, field_validator, model_validator
 from enum import Enum
+from typing import Optional
 import re
+from typing_extensions import TypedDict
 from uuid import UUID
 
 class Role(str, Enum):
@@ -55,3 +57,58 @@ class UserOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class UserPage(BaseModel):
+    items: list[UserOut]
+    next_cursor: Optional[str] = None
+    estimated_total: int
+
+
+# Serialization-only mirror of UserOut for rows read from the database,
+# derived from its fields so the two cannot drift. Rows are dumped without
+# re-validation (EmailStr checks alone cost more than the rest of the
+# response), so validating types become plain str and only trusted data
+# belongs here.
+_ROW_TYPES = {EmailStr: str, Role: str}
+UserOutRow = TypedDict("UserOutRow", {
+    name: _ROW_TYPES.get(field.annotation, field.annotation)
+    for name, field in UserOut.model_fields.items()
+})
+
+
+class UserPageRows(TypedDict):
+    items: list[UserOutRow]
+    next_cursor: Optional[str]
+    estimated_total: int
+
+
+# Built once; dump_json writes bytes directly, skipping jsonable_encoder
+user_out_adapter = TypeAdapter(UserOutRow)
+user_page_adapter = TypeAdapter(UserPageRows)
+
+
+class UserFilter(BaseModel):
+    role: Optional[Role] = None
+    is_verified: Optional[bool] = None
+
+
+class BulkStatusUpdate(BaseModel):
+    is_active: bool
+    user_ids: Optional[list[UUID]] = Field(default=None, max_length=10000)
+    filter: Optional[UserFilter] = None
+
+    @model_validator(mode="after")
+    def validate_target(self):
+        if (self.user_ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of user_ids or filter")
+        # An empty filter would match every user
+        if self.filter is not None and self.filter.role is None and self.filter.is_verified is None:
+            raise ValueError("filter must set at least one of role or is_verified")
+        return self
+
+
+class BulkStatusResult(BaseModel):
+    changed: list[UUID]
+    unchanged: list[UUID]
+    not_found: list[UUID]
@@ -1,88 +1,121 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status, Request, Response
 from datetime import datetime, timedelta
+from jose import jwt, JWTError
 
-from sqlalchemy import select
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
 
 from app.models.user import User
 from app.models.refresh_token import RefreshToken
-from app.models.otp import OTP
-from app.utils.password import hash_password, verify_password
-from app.core.security import create_access_token, create_refresh_token
+from app.utils.password import hash_password_async, verify_password
+from app.core.security import create_access_token, create_refresh_token, decode_access_token, hash_token
 from app.core.config import settings
+from app.core.claims_cache import access_claims_cache
+from app.core.profile_cache import profile_cache
+from app.core.metrics import JWT_DECODE_SECONDS
+from app.dependencies.auth import refresh_single_flight
 from app.services.email_service import EmailService
-from app.services.otp_service import generate_otp, otp_expiry
+from app.services.email_dispatcher import email_dispatcher
+from app.services.otp_service import generate_otp, store_otp, check_otp
+from app.services.otp_store import OTPCheck
 
 
-def signup(db: Session, data):
-    result = db.execute(
-        select(User).where(User.email == data.email)
-    )
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Email already exists"
-        )
-
-    
+async def signup(db: AsyncSession, data):
     user = User(
         name=data.name,
         email=data.email,
         phone=data.phone,
-        password=hash_password(data.password),
+        password=await hash_password_async(data.password),
         is_verified=False
     )
 
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-
-    
     otp_code = generate_otp()
 
-    otp = OTP(
-        email=user.email,
-        otp=otp_code,
-        expires_at=otp_expiry()
-    )
+    # Stored before the commit so a queued email always carries a code that
+    # can be verified. A rejected duplicate replaces nothing it could not
+    # already replace through /auth/resend-otp.
+    await store_otp(user.email, otp_code)
 
-    db.add(otp)
-    db.commit()
+    # User and OTP email go out in one transaction; duplicates are caught by
+    # the unique indexes rather than a pre-check SELECT.
+    db.add(user)
+    EmailService(db).send_otp_email(user.email, otp_code)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if "ix_users_email" in str(e.orig):
+            field = "Email"
+        elif "ix_users_phone" in str(e.orig):
+            field = "Phone"
+        else:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"{field} already exists"
+        )
 
-    
-    EmailService().send_otp_email(user.email, otp_code)
+    email_dispatcher.notify()
 
     return {"message": "Signup successful. Verify OTP."}
 
-def verify_otp(db: Session, email: str, otp_code: str):
-    otp = db.execute(
-        select(OTP).where(OTP.email == email, OTP.otp == otp_code)
-    ).scalar_one_or_none()
-
-    if not otp:
+async def resend_otp(db: AsyncSession, email: str):
+    """
+    Issue a fresh code for a pending signup, replacing the old one and its
+    attempt counter. The reply is the same whether or not the email has a
+    pending signup.
+    """
+    user_id = (await db.execute(
+        select(User.id).where(User.email == email, User.is_verified.is_(False))
+    )).scalar_one_or_none()
+
+    if user_id:
+        otp_code = generate_otp()
+        await store_otp(email, otp_code)
+        EmailService(db).send_otp_email(email, otp_code)
+        await db.commit()
+        email_dispatcher.notify()
+
+    return {"message": "If this email has a pending signup, a new OTP has been sent."}
+
+async def verify_otp(db: AsyncSession, email: str, otp_code: str):
+    result = await check_otp(email, otp_code)
+
+    # Missing and expired codes look like wrong ones, so the reply does not
+    # reveal whether an email has a pending signup
+    if result is OTPCheck.missing:
         raise HTTPException(status_code=400, detail="Invalid OTP")
 
-    if otp.expires_at < datetime.utcnow():
-        raise HTTPException(status_code=400, detail="OTP expired")
+    if result is OTPCheck.locked:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many invalid attempts. Please request a new OTP."
+        )
+
+    if result is OTPCheck.invalid:
+        raise HTTPException(status_code=400, detail="Invalid OTP")
 
-    user =   db.execute(
-        select(User).where(User.email == email)
-    ).scalar_one_or_none()
+    user_id = (await db.execute(
+        update(User)
+        .where(User.email == email)
+        .values(is_verified=True, updated_at=func.now())
+        .returning(User.id)
+    )).scalar_one_or_none()
 
-    if not user:
+    if not user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    user.is_verified = True
-
-    db.delete(otp)
-    db.commit()
+    await db.commit()
+    profile_cache.invalidate(user_id)
 
     return {"message": "Email verified successfully"}
 
-def login(db: Session, user: User):
+async def login(db: AsyncSession, user: User):
     if not verify_password:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
@@ -95,27 +128,32 @@ def login(db: Session, user: User):
 
     db_token = RefreshToken(
         user_id=user.id,
-        token=refresh_token,
+        token_hash=hash_token(refresh_token),
         expires_at=datetime.utcnow() + timedelta(
-            minutes=settings.REFRESH_TOKEN_EXPIRE_DAYS
+            days=settings.REFRESH_TOKEN_EXPIRE_DAYS
         )
     )
 
     db.add(db_token)
-    db.commit()
+    await db.commit()
 
     return access_token, refresh_token
 
 
 
-def logout_user(request: Request, response: Response, db: Session):
+async def logout_user(request: Request, response: Response, db: AsyncSession):
     refresh_token = request.cookies.get(settings.REFRESH_TOKEN_COOKIE_NAME)
+    access_token = request.cookies.get(settings.ACCESS_TOKEN_COOKIE_NAME)
+
+    if access_token:
+        access_claims_cache.invalidate(access_token)
 
     if refresh_token:
-        db.query(RefreshToken).filter(
-            RefreshToken.token == refresh_token
-        ).delete()
-        db.commit()
+        refresh_single_flight.forget(hash_token(refresh_token))
+        await db.execute(
+            delete(RefreshToken).where(RefreshToken.token_hash == hash_token(refresh_token))
+        )
+        await db.commit()
     
 
     response.delete_cookie(
@@ -129,18 +167,24 @@ def logout_user(request: Request, response: Response, db: Session):
     return {"message": "Logout successful"}
 
 
-def logout_all_sessions(
+async def logout_all_sessions(
     request: Request,
     response: Response,
-    db: Session,
+    db: AsyncSession,
     user_id: str
 ):
    
-    db.query(RefreshToken).filter(
-        RefreshToken.user_id == user_id
-    ).delete(synchronize_session=False)
-
-    db.commit()
+    revoked = (await db.execute(
+        delete(RefreshToken)
+        .where(RefreshToken.user_id == user_id)
+        .returning(RefreshToken.token_hash)
+    )).scalars().all()
+
+    await db.commit()
+    access_claims_cache.invalidate_subject(str(user_id))
+    # Refreshes coalesced before the delete must not hand out new tokens
+    for token_hash in revoked:
+        refresh_single_flight.forget(token_hash)
 
     response.delete_cookie(
         key=settings.ACCESS_TOKEN_COOKIE_NAME,
@@ -152,4 +196,59 @@ def logout_all_sessions(
     )
 
     return {"message": "Logged out from all devices"}
-    
\ No newline at end of file
+
+
+def _decode_any(token: str):
+    """
+    Returns (token_type, claims), or (None, None) if neither key verifies it.
+    """
+    claims = access_claims_cache.get(token)
+    if claims is not None:
+        return "access", claims
+    try:
+        with JWT_DECODE_SECONDS.labels("access").time():
+            claims = decode_access_token(token)
+        access_claims_cache.put(token, claims)
+        return "access", claims
+    except JWTError:
+        pass
+    try:
+        with JWT_DECODE_SECONDS.labels("refresh").time():
+            claims = jwt.decode(
+                token,
+                settings.REFRESH_TOKEN_SECRET_KEY,
+                algorithms=[settings.REFRESH_TOKEN_ALGORITHM]
+            )
+        return "refresh", claims
+    except JWTError:
+        return None, None
+
+
+async def introspect_tokens(db: AsyncSession, tokens: list[str]) -> dict:
+    # Up to two signature checks per token; keep them off the event loop
+    decoded = await run_in_threadpool(lambda: [_decode_any(token) for token in tokens])
+
+    # Every refresh token in the batch is checked against the table at once
+    refresh_hashes = {
+        hash_token(token)
+        for token, (token_type, _) in zip(tokens, decoded)
+        if token_type == "refresh"
+    }
+    live_hashes = set()
+    if refresh_hashes:
+        live_hashes = set((await db.execute(
+            select(RefreshToken.token_hash).where(
+                RefreshToken.token_hash.in_(refresh_hashes),
+                RefreshToken.expires_at > datetime.utcnow()
+            )
+        )).scalars())
+
+    results = []
+    for token, (token_type, claims) in zip(tokens, decoded):
+        if token_type == "refresh" and hash_token(token) not in live_hashes:
+            token_type = None
+        if token_type is None:
+            results.append({"active": False})
+        else:
+            results.append({"active": True, "token_type": token_type, "claims": claims})
+    return {"results": results}
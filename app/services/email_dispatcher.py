@@ -0,0 +1,272 @@
+import asyncio
+import queue
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select, update, or_
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import SMTP_SEND_SECONDS
+from app.core.database import AsyncSessionLocal
+from app.models.email_outbox import EmailOutbox, EmailStatus
+from app.services.email_service import build_message
+
+logger = get_logger(__name__)
+
+# Returned by `_deliver` when another worker has reclaimed the row
+_LEASE_LOST = object()
+
+
+class _PooledConnection:
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        try:
+            self.server.quit()
+        except Exception:
+            self.server.close()
+
+
+class SMTPConnectionPool:
+    """
+    Small pool of long-lived, already authenticated SMTP connections.
+
+    A connection is recycled after SMTP_MAX_MESSAGES_PER_CONNECTION messages
+    or when it has been idle longer than SMTP_IDLE_TIMEOUT_SECONDS.
+    """
+
+    def __init__(
+        self,
+        size: int = settings.SMTP_POOL_SIZE,
+        max_messages: int = settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+        idle_timeout: float = settings.SMTP_IDLE_TIMEOUT_SECONDS
+    ):
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue()
+
+    def _connect(self) -> _PooledConnection:
+        server = smtplib.SMTP(
+            settings.SMTP_HOST,
+            settings.SMTP_PORT,
+            timeout=settings.SMTP_TIMEOUT_SECONDS
+        )
+        try:
+            if settings.SMTP_STARTTLS:
+                server.starttls()
+            if settings.SMTP_USER:
+                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        except Exception:
+            server.close()
+            raise
+        return _PooledConnection(server)
+
+    def _checkout(self) -> _PooledConnection:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - conn.last_used < self.idle_timeout:
+                return conn
+            conn.close()
+
+    def send(self, to_email: str, message: str) -> None:
+        start = time.perf_counter()
+        try:
+            self._send(to_email, message)
+        except Exception:
+            SMTP_SEND_SECONDS.labels("error").observe(time.perf_counter() - start)
+            raise
+        SMTP_SEND_SECONDS.labels("sent").observe(time.perf_counter() - start)
+
+    def _send(self, to_email: str, message: str) -> None:
+        with self._slots:
+            conn = self._checkout()
+            try:
+                conn.server.sendmail(settings.EMAIL_FROM, to_email, message)
+            except (smtplib.SMTPServerDisconnected, OSError):
+                conn.server.close()
+                raise
+            except smtplib.SMTPException:
+                try:
+                    conn.server.rset()
+                    self._idle.put(conn)
+                except Exception:
+                    conn.server.close()
+                raise
+
+            conn.sent += 1
+            conn.last_used = time.monotonic()
+            if conn.sent >= self.max_messages:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class EmailOutboxDispatcher:
+    """
+    Drains the email outbox in the background.
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED so several workers
+    can run a dispatcher at once. A claimed row is leased for
+    EMAIL_OUTBOX_LEASE_SECONDS, renewed just before its message is sent, and
+    picked up again if its worker dies. Results are only written while the
+    claim still holds (same status and attempt count), so a worker whose
+    lease ran out never overwrites the row another worker reclaimed.
+    """
+
+    def __init__(self, pool: Optional[SMTPConnectionPool] = None):
+        self.pool = pool or SMTPConnectionPool()
+        self._wakeup = asyncio.Event()
+        self._sending = asyncio.Semaphore(settings.SMTP_POOL_SIZE)
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await run_in_threadpool(self.pool.close)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.dispatch_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("email outbox dispatch failed")
+                processed = 0
+
+            if processed >= settings.EMAIL_OUTBOX_BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.EMAIL_OUTBOX_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _claim_batch(self) -> list[EmailOutbox]:
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(EmailOutbox)
+                .where(
+                    or_(
+                        EmailOutbox.status == EmailStatus.pending,
+                        EmailOutbox.status == EmailStatus.sending
+                    ),
+                    EmailOutbox.next_attempt_at <= now
+                )
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(settings.EMAIL_OUTBOX_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )).scalars().all()
+
+            lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+            for row in rows:
+                row.status = EmailStatus.sending
+                row.attempts += 1
+                row.next_attempt_at = lease_until
+            await db.commit()
+            return rows
+
+    def _owned(self, row: EmailOutbox):
+        """
+        Matches `row` only while this worker's claim on it still holds.
+        """
+        return update(EmailOutbox).where(
+            EmailOutbox.id == row.id,
+            EmailOutbox.status == EmailStatus.sending,
+            EmailOutbox.attempts == row.attempts
+        )
+
+    async def _renew_lease(self, row: EmailOutbox) -> bool:
+        lease_until = datetime.utcnow() + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(self._owned(row).values(next_attempt_at=lease_until))
+            await db.commit()
+        return result.rowcount == 1
+
+    async def _deliver(self, row: EmailOutbox) -> object:
+        """
+        Returns None once sent, the error message, or `_LEASE_LOST`.
+        """
+        message = build_message(settings.EMAIL_FROM, row.to_email, row.subject, row.html_content)
+        async with self._sending:
+            # The batch lease may have run out while this row waited for a
+            # connection; restart it for this message, or leave the row to
+            # whichever worker reclaimed it
+            if not await self._renew_lease(row):
+                return _LEASE_LOST
+            try:
+                await run_in_threadpool(self.pool.send, row.to_email, message)
+            except Exception as e:
+                return str(e) or e.__class__.__name__
+        return None
+
+    async def dispatch_once(self) -> int:
+        rows = await self._claim_batch()
+        if not rows:
+            return 0
+
+        errors = await asyncio.gather(*(self._deliver(row) for row in rows))
+
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            for row, error in zip(rows, errors):
+                if error is _LEASE_LOST:
+                    logger.warning("email outbox lease lost", extra={"outbox_id": str(row.id)})
+                    continue
+                if error is None:
+                    values = {"status": EmailStatus.sent, "sent_at": now, "last_error": None}
+                else:
+                    logger.warning(
+                        "email delivery failed",
+                        extra={"outbox_id": str(row.id), "attempt": row.attempts, "error": error}
+                    )
+                    if row.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                        values = {"status": EmailStatus.failed, "last_error": error}
+                    else:
+                        delay = settings.EMAIL_OUTBOX_BACKOFF_SECONDS * 2 ** (row.attempts - 1)
+                        values = {
+                            "status": EmailStatus.pending,
+                            "next_attempt_at": now + timedelta(seconds=delay),
+                            "last_error": error
+                        }
+                result = await db.execute(self._owned(row).values(**values))
+                if result.rowcount != 1:
+                    logger.warning("email outbox lease lost", extra={"outbox_id": str(row.id)})
+            await db.commit()
+
+        return len(rows)
+
+
+email_dispatcher = EmailOutboxDispatcher()
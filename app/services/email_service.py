@@ -3,15 +3,36 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.email_outbox import EmailOutbox
+
+
+logger = get_logger(__name__)
+
+
+def build_message(email_from: str, to_email: str, subject: str, html_content: str) -> str:
+    message = MIMEMultipart("alternative")
+    message["From"] = email_from
+    message["To"] = to_email
+    message["Subject"] = subject
+
+    message.attach(MIMEText(html_content, "html"))
+    return message.as_string()
 
 
 class EmailService:
     """
-    Production-ready email service using SMTP
+    Production-ready email service using SMTP.
+
+    When constructed with a session, messages are written to the outbox in
+    that session's transaction and delivered by the background dispatcher.
     """
 
-    def __init__(self):
+    def __init__(self, db: Optional[AsyncSession] = None):
+        self.db = db
         self.smtp_host = settings.SMTP_HOST
         self.smtp_port = settings.SMTP_PORT
         self.smtp_user = settings.SMTP_USER
@@ -22,23 +43,30 @@ class EmailService:
         """
         Internal method to send email
         """
-        try:
-            message = MIMEMultipart("alternative")
-            message["From"] = self.email_from
-            message["To"] = to_email
-            message["Subject"] = subject
+        if self.db is not None:
+            self.db.add(
+                EmailOutbox(
+                    to_email=to_email,
+                    subject=subject,
+                    html_content=html_content
+                )
+            )
+            return
 
-            message.attach(MIMEText(html_content, "html"))
+        try:
+            message = build_message(self.email_from, to_email, subject, html_content)
 
             with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.sendmail(self.email_from, to_email, message.as_string())
+                if settings.SMTP_STARTTLS:
+                    server.starttls()
+                if self.smtp_user:
+                    server.login(self.smtp_user, self.smtp_password)
+                server.sendmail(self.email_from, to_email, message)
 
-            print(f"📧 Email sent to {to_email}")
+            logger.info("email sent", extra={"to_email": to_email})
 
-        except Exception as e:
-            print(f"❌ Email sending failed: {e}")
+        except Exception:
+            logger.exception("email sending failed", extra={"to_email": to_email})
 
     def send_otp_email(self, to_email: str, otp: str) -> None:
         subject = "Verify your email - OTP"
@@ -0,0 +1,67 @@
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User, Role
+from app.models.refresh_token import RefreshToken
+from app.core.security import create_access_token, create_refresh_token, hash_token
+from app.core.config import settings
+from app.core.profile_cache import profile_cache
+
+
+async def oauth_login(db: AsyncSession, email: str, name: str):
+    """
+    Find-or-create the user for a provider-verified email and open a session.
+
+    The upsert and the refresh-token insert share one transaction; concurrent
+    first logins for the same email resolve on the unique email index.
+    """
+    stmt = insert(User).values(
+        id=uuid.uuid4(),
+        name=name,
+        email=email,
+        phone=None,
+        password="oauth",
+        role=Role.user,
+        is_active=True,
+        is_verified=True
+    )
+    # A no-op update so RETURNING also yields the existing row; it leaves
+    # the profile (and its /users/me ETag) untouched. xmax is 0 only on a
+    # freshly inserted row.
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.email],
+        set_={"email": stmt.excluded.email}
+    ).returning(User.id, User.role, User.is_active, (literal_column("xmax") == 0).label("inserted"))
+
+    user_id, role, is_active, inserted = (await db.execute(stmt)).one()
+
+    if not is_active:
+        await db.rollback()
+        raise HTTPException(403, "Account deactivated")
+
+    access_token = create_access_token({
+        "sub": str(user_id),
+        "role": role.value
+    })
+
+    refresh_token = create_refresh_token({"sub": str(user_id)})
+
+    db.add(
+        RefreshToken(
+            user_id=user_id,
+            token_hash=hash_token(refresh_token),
+            expires_at=datetime.utcnow() + timedelta(
+                days=settings.REFRESH_TOKEN_EXPIRE_DAYS
+            )
+        )
+    )
+    await db.commit()
+    if inserted:
+        profile_cache.invalidate(user_id)
+
+    return access_token, refresh_token
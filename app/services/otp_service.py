@@ -1,11 +1,17 @@
 import secrets
-from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.services.otp_store import otp_store, OTPCheck
 
 def generate_otp() -> str:
     # Secure 6-digit OTP
     return str(secrets.randbelow(900000) + 100000)
 
-def otp_expiry() -> datetime:
-    return datetime.utcnow() + timedelta(minutes=5)
+def otp_ttl_seconds() -> int:
+    return settings.OTP_EXPIRE_MINUTES * 60
 
+async def store_otp(email: str, otp_code: str) -> None:
+    await otp_store.put(email, otp_code, otp_ttl_seconds())
 
+async def check_otp(email: str, otp_code: str) -> OTPCheck:
+    return await otp_store.verify(email, otp_code, settings.OTP_MAX_ATTEMPTS)
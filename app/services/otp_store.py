@@ -0,0 +1,159 @@
+import hmac
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from enum import Enum
+
+from app.core.config import settings
+
+
+class OTPCheck(str, Enum):
+    valid = "valid"
+    invalid = "invalid"
+    missing = "missing"
+    locked = "locked"
+
+
+class OTPStore(ABC):
+    """
+    Key-value store for pending OTPs with native expiry.
+
+    One OTP per email: `put` replaces any previous code and resets the
+    attempt counter. `verify` consumes the code on success and drops it once
+    `max_attempts` wrong guesses have been made.
+    """
+
+    @abstractmethod
+    async def put(self, email: str, code: str, ttl_seconds: int) -> None:
+        ...
+
+    @abstractmethod
+    async def verify(self, email: str, code: str, max_attempts: int) -> OTPCheck:
+        ...
+
+    async def purge_expired(self) -> int:
+        return 0
+
+    async def close(self) -> None:
+        pass
+
+
+class _Shard:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # email -> [code, expires_at, attempts]
+        self.entries: dict[str, list] = {}
+
+
+class MemoryOTPStore(OTPStore):
+    """
+    Sharded in-process store. Only correct when a single worker serves both
+    signup and verification.
+    """
+
+    def __init__(self, shards: int = 16):
+        self._shards = [_Shard() for _ in range(max(shards, 1))]
+
+    def _shard(self, email: str) -> _Shard:
+        return self._shards[zlib.crc32(email.encode()) % len(self._shards)]
+
+    async def put(self, email: str, code: str, ttl_seconds: int) -> None:
+        shard = self._shard(email)
+        with shard.lock:
+            shard.entries[email] = [code, time.monotonic() + ttl_seconds, 0]
+
+    async def verify(self, email: str, code: str, max_attempts: int) -> OTPCheck:
+        shard = self._shard(email)
+        with shard.lock:
+            entry = shard.entries.get(email)
+            if entry is None or entry[1] <= time.monotonic():
+                shard.entries.pop(email, None)
+                return OTPCheck.missing
+            if hmac.compare_digest(entry[0].encode(), code.encode()):
+                del shard.entries[email]
+                return OTPCheck.valid
+            entry[2] += 1
+            if entry[2] >= max_attempts:
+                del shard.entries[email]
+                return OTPCheck.locked
+            return OTPCheck.invalid
+
+    async def purge_expired(self) -> int:
+        now = time.monotonic()
+        purged = 0
+        for shard in self._shards:
+            with shard.lock:
+                expired = [email for email, entry in shard.entries.items() if entry[1] <= now]
+                for email in expired:
+                    del shard.entries[email]
+                purged += len(expired)
+        return purged
+
+
+# Returns 1 valid, 0 missing, 2 invalid, 3 locked (code dropped)
+_VERIFY_SCRIPT = """
+local code = redis.call('HGET', KEYS[1], 'code')
+if not code then return 0 end
+if code == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+    return 3
+end
+return 2
+"""
+
+_VERIFY_RESULTS = {
+    0: OTPCheck.missing,
+    1: OTPCheck.valid,
+    2: OTPCheck.invalid,
+    3: OTPCheck.locked,
+}
+
+
+class RedisOTPStore(OTPStore):
+    """
+    Store backed by a Redis-protocol server, shared by every worker.
+    """
+
+    def __init__(self, url: str, prefix: str = "otp:"):
+        from redis.asyncio import Redis
+
+        self.prefix = prefix
+        self._redis = Redis.from_url(url, decode_responses=True)
+        self._verify = self._redis.register_script(_VERIFY_SCRIPT)
+
+    async def put(self, email: str, code: str, ttl_seconds: int) -> None:
+        key = self.prefix + email
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping={"code": code, "attempts": 0})
+            pipe.expire(key, ttl_seconds)
+            await pipe.execute()
+
+    async def verify(self, email: str, code: str, max_attempts: int) -> OTPCheck:
+        result = await self._verify(keys=[self.prefix + email], args=[code, max_attempts])
+        return _VERIFY_RESULTS[int(result)]
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def _create_store() -> OTPStore:
+    if settings.OTP_STORE_BACKEND == "redis":
+        if not settings.OTP_STORE_URL:
+            raise RuntimeError("OTP_STORE_URL is required for the redis OTP store")
+        return RedisOTPStore(settings.OTP_STORE_URL)
+    if settings.ENV != "development":
+        raise RuntimeError(
+            "The memory OTP store is per process; set OTP_STORE_BACKEND=redis "
+            "outside single-worker development"
+        )
+    return MemoryOTPStore(settings.OTP_STORE_SHARDS)
+
+
+otp_store = _create_store()
@@ -0,0 +1,112 @@
+"""
+Deletes expired refresh tokens in bounded batches and purges expired OTPs.
+
+Runs as a lifespan background task, or standalone:
+
+    python -m app.services.reaper          # loop every REAPER_INTERVAL_SECONDS
+    python -m app.services.reaper --once   # single pass, e.g. from cron
+"""
+import argparse
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, delete
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, async_engine
+from app.core.logging import configure_logging, get_logger
+from app.core.metrics import REAPER_DELETED
+from app.models.refresh_token import RefreshToken
+from app.services.otp_store import otp_store
+
+logger = get_logger(__name__)
+
+
+async def reap_refresh_tokens(
+    batch_size: int = settings.REAPER_BATCH_SIZE,
+    pause: float = settings.REAPER_BATCH_PAUSE_SECONDS
+) -> int:
+    """
+    Delete expired refresh tokens, one short transaction per batch so locks
+    and WAL volume stay bounded.
+    """
+    total = 0
+    now = datetime.utcnow()
+    while True:
+        batch = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < now)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(RefreshToken).where(RefreshToken.id.in_(batch))
+            )
+            await db.commit()
+
+        total += result.rowcount
+        REAPER_DELETED.labels("refresh_token").inc(result.rowcount)
+        if result.rowcount < batch_size:
+            return total
+        await asyncio.sleep(pause)
+
+
+async def reap_once() -> dict:
+    refresh_tokens = await reap_refresh_tokens()
+    otps = await otp_store.purge_expired()
+    REAPER_DELETED.labels("otp").inc(otps)
+    logger.info("reaper pass finished", extra={"refresh_tokens": refresh_tokens, "otps": otps})
+    return {"refresh_tokens": refresh_tokens, "otps": otps}
+
+
+class Reaper:
+    def __init__(self, interval: float = settings.REAPER_INTERVAL_SECONDS):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await reap_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("reaper pass failed")
+            await asyncio.sleep(self.interval)
+
+
+reaper = Reaper()
+
+
+async def _main(once: bool) -> None:
+    try:
+        if once:
+            await reap_once()
+        else:
+            await reaper.run()
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete expired refresh tokens and OTPs")
+    parser.add_argument("--once", action="store_true", help="run a single pass and exit")
+    args = parser.parse_args()
+
+    configure_logging(settings.LOG_LEVEL)
+    asyncio.run(_main(args.once))
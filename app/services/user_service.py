@@ -1,23 +1,274 @@
-from sqlalchemy.orm import Session
+import base64
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Callable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, func, literal_column, tuple_, cast, String
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from uuid import UUID
 from fastapi import HTTPException
 
-from app.models.user import User
+from app.core.database import AsyncSessionLocal
+from app.core.replicas import replica_router
+from app.core.profile_cache import profile_cache
+from app.models.user import User, Role
+from app.models.refresh_token import RefreshToken
+from app.schemas.user import user_out_adapter
+from app.utils.etag import make_etag
 
-def get_my_profile(db: Session, user_id: UUID):
-    user = db.query(User).filter(User.id == user_id).first()
+USERS_PAGE_DEFAULT = 50
+USERS_PAGE_MAX = 200
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = (
+    User.id,
+    User.name,
+    User.email,
+    User.phone,
+    User.role,
+    User.is_active,
+    User.is_verified,
+    User.created_at,
+    User.updated_at,
+)
+# Exactly the UserOut fields, so responses never load whole entities
+USER_OUT_COLUMNS = (
+    User.id,
+    User.name,
+    User.email,
+    User.role,
+    User.is_active,
+    User.is_verified,
+)
+USER_OUT_FIELDS = tuple(column.key for column in USER_OUT_COLUMNS)
+
+
+def _user_out_dict(row) -> dict:
+    # Rows lead with USER_OUT_COLUMNS; any extra trailing columns are dropped
+    return dict(zip(USER_OUT_FIELDS, row))
+
+
+async def _get_user(db: AsyncSession, user_id: UUID):
+    return (await db.execute(
+        select(User).where(User.id == user_id)
+    )).scalar_one_or_none()
+
+async def get_my_profile(db: AsyncSession, user_id: UUID):
+    user = (await db.execute(
+        select(*USER_OUT_COLUMNS, User.updated_at).where(User.id == user_id)
+    )).one_or_none()
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     return user
 
-def get_all_users(db: Session):
-    return db.query(User).all()
 
+async def get_my_profile_json(
+    db: AsyncSession,
+    user_id: UUID,
+    if_none_match: Optional[Callable[[str], bool]] = None
+) -> tuple[Optional[bytes], str]:
+    """
+    `/users/me` body and ETag, served from `profile_cache` when possible.
+
+    The body is None when `if_none_match(etag)` holds and the profile was
+    not cached, so it is never serialized.
+    """
+    profile, fill = profile_cache.get(user_id)
+    if profile is not None:
+        return profile
+
+    if fill.use_primary:
+        # Changed moments ago; a replica may still return the old row
+        async with AsyncSessionLocal() as primary:
+            user = await get_my_profile(primary, user_id)
+    else:
+        user = await get_my_profile(db, user_id)
+    etag = make_etag(user.id, user.updated_at.isoformat())
+    if if_none_match is not None and if_none_match(etag):
+        return None, etag
+
+    body = user_out_adapter.dump_json(_user_out_dict(user))
+    profile_cache.put(user_id, (body, etag), fill)
+    return body, etag
+
+def _encode_cursor(user: User) -> str:
+    raw = json.dumps([user.created_at.isoformat(), str(user.id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, user_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(user_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _user_filters(
+    role: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    is_verified: Optional[bool] = None
+) -> list:
+    filters = []
+    if role is not None:
+        filters.append(User.role == Role(role))
+    if is_active is not None:
+        filters.append(User.is_active == is_active)
+    if is_verified is not None:
+        filters.append(User.is_verified == is_verified)
+    return filters
+
+
+async def _estimate_count(db: AsyncSession, stmt) -> int:
+    """
+    Planner row estimate for `stmt`, avoiding a full COUNT(*) scan.
+    """
+    conn = await db.connection()
+    sql = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _page_query(
+    columns,
+    limit: int,
+    cursor: Optional[str],
+    role: Optional[str],
+    is_active: Optional[bool],
+    is_verified: Optional[bool]
+):
+    filters = _user_filters(role, is_active, is_verified)
+    stmt = select(*columns).where(*filters)
+    if cursor:
+        stmt = stmt.where(tuple_(User.created_at, User.id) > _decode_cursor(cursor))
+    return stmt.order_by(User.created_at, User.id).limit(min(limit, USERS_PAGE_MAX) + 1), filters
+
+
+async def users_page_etag(
+    db: AsyncSession,
+    limit: int = USERS_PAGE_DEFAULT,
+    cursor: Optional[str] = None,
+    role: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    is_verified: Optional[bool] = None
+) -> str:
+    """
+    Weak ETag for a `/users/all` page, from count, max(updated_at) and a
+    digest of (id, updated_at) over the page window, aggregated in SQL.
 
-def deactivate_user(db: Session, user_id: UUID):
-    user = db.query(User).filter(User.id == user_id).first()
+    Only covers items and next_cursor; estimated_total may drift under it.
+    """
+    window = _page_query(
+        (User.id, User.created_at, User.updated_at),
+        limit, cursor, role, is_active, is_verified
+    )[0].subquery()
+    row_key = cast(window.c.id, String) + ":" + cast(window.c.updated_at, String)
+    count, max_updated_at, digest = (await db.execute(
+        select(
+            func.count(),
+            func.max(window.c.updated_at),
+            func.md5(func.string_agg(
+                row_key,
+                aggregate_order_by(literal_column("','"), window.c.created_at, window.c.id)
+            ))
+        )
+    )).one()
+    return make_etag(
+        count, max_updated_at, digest,
+        limit, cursor, role, is_active, is_verified,
+        weak=True
+    )
+
+
+async def get_all_users(
+    db: AsyncSession,
+    limit: int = USERS_PAGE_DEFAULT,
+    cursor: Optional[str] = None,
+    role: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    is_verified: Optional[bool] = None
+):
+    limit = min(limit, USERS_PAGE_MAX)
+    stmt, filters = _page_query(
+        (*USER_OUT_COLUMNS, User.created_at),
+        limit, cursor, role, is_active, is_verified
+    )
+
+    rows = (await db.execute(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1])
+
+    return {
+        "items": [_user_out_dict(row) for row in rows],
+        "next_cursor": next_cursor,
+        "estimated_total": await _estimate_count(db, select(User.id).where(*filters))
+    }
+
+
+def _export_value(value):
+    if isinstance(value, Role):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+async def export_users(
+    fmt: str,
+    role: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    is_verified: Optional[bool] = None
+) -> AsyncIterator[bytes]:
+    """
+    Stream users as NDJSON or CSV from a server-side cursor.
+
+    Owns its session: request-scoped dependencies are torn down before a
+    streaming body is sent.
+    """
+    names = [column.key for column in EXPORT_COLUMNS]
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .where(*_user_filters(role, is_active, is_verified))
+        .order_by(User.created_at, User.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(names)
+        yield buffer.getvalue().encode()
+
+    async with await replica_router.session() as db:
+        result = await db.stream(stmt)
+        try:
+            async for rows in result.partitions():
+                buffer = io.StringIO()
+                if fmt == "csv":
+                    writer = csv.writer(buffer)
+                    for row in rows:
+                        writer.writerow([_export_value(v) for v in row])
+                else:
+                    for row in rows:
+                        buffer.write(json.dumps(dict(zip(names, map(_export_value, row)))))
+                        buffer.write("\n")
+                yield buffer.getvalue().encode()
+        finally:
+            await result.close()
+
+
+async def deactivate_user(db: AsyncSession, user_id: UUID):
+    user = await _get_user(db, user_id)
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -25,13 +276,14 @@ def deactivate_user(db: Session, user_id: UUID):
         raise HTTPException(status_code=400, detail="User is already deactivated")
 
     user.is_active = False
-    db.commit()
+    await db.commit()
+    profile_cache.invalidate(user_id)
 
     return {"message": "User deactivated"}
 
 
-def activate_user(db: Session, user_id: UUID):
-    user = db.query(User).filter(User.id == user_id).first()
+async def activate_user(db: AsyncSession, user_id: UUID):
+    user = await _get_user(db, user_id)
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -39,7 +291,70 @@ def activate_user(db: Session, user_id: UUID):
         raise HTTPException(status_code=400, detail="User is already active")
 
     user.is_active = True
-    db.commit()
+    await db.commit()
+    profile_cache.invalidate(user_id)
 
     return {"message": "User activated"}
 
+
+async def bulk_set_active(
+    db: AsyncSession,
+    is_active: bool,
+    user_ids: Optional[list[UUID]] = None,
+    role: Optional[str] = None,
+    is_verified: Optional[bool] = None,
+    exclude_user_id: Optional[UUID] = None
+):
+    """
+    Set is_active for many users in one statement.
+
+    Targets either explicit ids or a filter (only users not already in the
+    requested state). Deactivation also revokes the targets' refresh tokens
+    in the same statement. `exclude_user_id` (the calling admin) is never
+    changed; if listed in `user_ids` it is reported as unchanged.
+    """
+    if user_ids is not None:
+        target_filters = [User.id.in_(user_ids)]
+    else:
+        target_filters = _user_filters(role, None, is_verified) + [User.is_active != is_active]
+    if exclude_user_id is not None:
+        target_filters.append(User.id != exclude_user_id)
+
+    target = (
+        select(User.id, User.is_active)
+        .where(*target_filters)
+        .with_for_update()
+        .cte("target")
+    )
+    changed = (
+        update(User)
+        .where(User.id == target.c.id, target.c.is_active != is_active)
+        .values(is_active=is_active, updated_at=func.now())
+        .returning(User.id)
+        .cte("changed")
+    )
+    stmt = (
+        select(target.c.id, changed.c.id.is_not(None))
+        .select_from(target.outerjoin(changed, changed.c.id == target.c.id))
+    )
+    if not is_active:
+        stmt = stmt.add_cte(
+            delete(RefreshToken)
+            .where(RefreshToken.user_id.in_(select(target.c.id)))
+            .cte("revoked")
+        )
+
+    rows = (await db.execute(stmt)).all()
+    await db.commit()
+
+    result = {"changed": [], "unchanged": [], "not_found": []}
+    for user_id, was_changed in rows:
+        result["changed" if was_changed else "unchanged"].append(user_id)
+    profile_cache.invalidate(*result["changed"])
+    if user_ids is not None:
+        found = {user_id for user_id, _ in rows}
+        if exclude_user_id in user_ids:
+            found.add(exclude_user_id)
+            result["unchanged"].append(exclude_user_id)
+        result["not_found"] = [user_id for user_id in dict.fromkeys(user_ids) if user_id not in found]
+    return result
@@ -0,0 +1,22 @@
+import hashlib
+
+from fastapi import Request
+
+
+def make_etag(*parts, weak: bool = False) -> str:
+    digest = hashlib.sha256(":".join(map(str, parts)).encode()).hexdigest()[:32]
+    return f'{"W/" if weak else ""}"{digest}"'
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """
+    True when the request's If-None-Match covers `etag` (weak comparison,
+    as RFC 9110 requires for this header).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
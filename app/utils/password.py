@@ -1,5 +1,15 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
+from app.core.config import settings
+from app.core.metrics import PASSWORD_HASH_SECONDS, PASSWORD_HASH_REJECTED
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def hash_password(password: str):
@@ -8,4 +18,57 @@ def hash_password(password: str):
 def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
 
-    
\ No newline at end of file
+
+# bcrypt runs on a dedicated pool so login/signup CPU cost never blocks the
+# event loop. Running + queued jobs are capped; beyond that we shed load.
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(settings.HASH_POOL_SIZE + settings.HASH_QUEUE_SIZE)
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                if settings.HASH_EXECUTOR == "process":
+                    _executor = ProcessPoolExecutor(max_workers=settings.HASH_POOL_SIZE)
+                else:
+                    _executor = ThreadPoolExecutor(
+                        max_workers=settings.HASH_POOL_SIZE,
+                        thread_name_prefix="password-hash"
+                    )
+    return _executor
+
+
+async def _run_bounded(operation: str, func, *args):
+    if not _slots.acquire(blocking=False):
+        PASSWORD_HASH_REJECTED.inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy. Please retry shortly.",
+            headers={"Retry-After": "1"}
+        )
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    finally:
+        _slots.release()
+        PASSWORD_HASH_SECONDS.labels(operation).observe(time.perf_counter() - start)
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_bounded("hash", hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await _run_bounded("verify", verify_password, password, hashed)
+
+
+def shutdown_hash_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
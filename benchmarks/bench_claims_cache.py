@@ -0,0 +1,46 @@
+"""
+Microbenchmark: get_current_user with and without the verified-claims cache.
+
+    python -m benchmarks.bench_claims_cache [iterations]
+"""
+import asyncio
+import sys
+import time
+
+from benchmarks import _env  # noqa: F401
+
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.core.claims_cache import access_claims_cache
+from app.dependencies.auth import get_current_user
+
+
+def _request(access_token: str) -> Request:
+    cookie = f"{settings.ACCESS_TOKEN_COOKIE_NAME}={access_token}".encode()
+    return Request({"type": "http", "headers": [(b"cookie", cookie)]})
+
+
+async def _run(iterations: int, cached: bool) -> float:
+    token = create_access_token({"sub": "00000000-0000-0000-0000-000000000001", "role": "user"})
+    access_claims_cache.clear()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if not cached:
+            access_claims_cache.clear()
+        await get_current_user(_request(token))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for label, cached in (("uncached", False), ("cached", True)):
+        elapsed = asyncio.run(_run(iterations, cached))
+        print(f"{label:>9}: {elapsed / iterations * 1e6:8.2f} us/call  ({iterations} calls)")
+    print(f"cache stats: {access_claims_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
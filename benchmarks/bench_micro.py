@@ -0,0 +1,70 @@
+"""
+Microbenchmarks for the per-request auth primitives.
+
+    python -m benchmarks.bench_micro --output bench_micro.json
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks import _env  # noqa: F401
+
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.claims_cache import access_claims_cache
+from app.core.security import create_access_token
+from app.dependencies.auth import get_current_user
+from app.utils.password import hash_password, verify_password
+from benchmarks._stats import summarize, write_results
+
+
+def _time(fn, iterations: int) -> dict:
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return summarize(samples, time.perf_counter() - start)
+
+
+def _request(access_token: str) -> Request:
+    cookie = f"{settings.ACCESS_TOKEN_COOKIE_NAME}={access_token}".encode()
+    return Request({"type": "http", "headers": [(b"cookie", cookie)]})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Auth microbenchmarks")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--bcrypt-iterations", type=int, default=20)
+    parser.add_argument("--output", default="bench_micro.json")
+    args = parser.parse_args()
+
+    claims = {"sub": "00000000-0000-0000-0000-000000000001", "role": "user"}
+    token = create_access_token(claims)
+    hashed = hash_password("Bench#Pass1")
+    loop = asyncio.new_event_loop()
+
+    def current_user(cached: bool):
+        def run():
+            if not cached:
+                access_claims_cache.clear()
+            loop.run_until_complete(get_current_user(_request(token)))
+        return run
+
+    results = {
+        "create_access_token": _time(lambda: create_access_token(claims), args.iterations),
+        "get_current_user_uncached": _time(current_user(False), args.iterations),
+        "get_current_user_cached": _time(current_user(True), args.iterations),
+        "verify_password": _time(lambda: verify_password("Bench#Pass1", hashed), args.bcrypt_iterations),
+    }
+    loop.close()
+
+    for name, summary in results.items():
+        print(f"{name:>28}: {summary}")
+    write_results(args.output, "auth_micro", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Serialization cost of `/users/all` pages, before and after the fast path.
+
+    python -m benchmarks.bench_serialization --users 10000 100000 --output bench_serialization.json
+
+No database is needed: users are built in memory and serialized page by
+page (USERS_PAGE_MAX rows per page), the way the endpoint would.
+
+- orm_jsonable: ORM entities -> UserPage -> jsonable_encoder -> json.dumps,
+  FastAPI's default JSONResponse route
+- orm_orjson: same, rendered by ORJSONResponse (the new default class)
+- rows_type_adapter: column rows -> dicts -> precompiled TypeAdapter ->
+  dump_json without re-validation, what `/users/all` now does
+"""
+import argparse
+import json
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from benchmarks import _env  # noqa: F401
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from app.models.user import User, Role
+from app.schemas.user import UserPage, user_page_adapter
+from app.services.user_service import USERS_PAGE_MAX, _user_out_dict
+from benchmarks._stats import summarize, write_results
+
+UserRow = namedtuple("UserRow", "id name email role is_active is_verified created_at")
+
+
+def _make_users(count: int):
+    base = datetime(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        rows.append(UserRow(
+            id=uuid.uuid4(),
+            name=f"Bench User {i}",
+            email=f"bench-{i}@example.com",
+            role=Role.admin if i % 50 == 0 else Role.user,
+            is_active=i % 7 != 0,
+            is_verified=i % 3 != 0,
+            created_at=base + timedelta(seconds=i),
+        ))
+    entities = [User(phone=None, password="x", **row._asdict()) for row in rows]
+    return entities, rows
+
+
+def _pages(items: list, page_size: int):
+    for start in range(0, len(items), page_size):
+        yield {
+            "items": items[start:start + page_size],
+            "next_cursor": "bench-cursor",
+            "estimated_total": len(items),
+        }
+
+
+def orm_jsonable(page) -> bytes:
+    content = jsonable_encoder(UserPage.model_validate(page, from_attributes=True))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def orm_orjson(page) -> bytes:
+    content = jsonable_encoder(UserPage.model_validate(page, from_attributes=True))
+    return orjson.dumps(content)
+
+
+def rows_type_adapter(page) -> bytes:
+    return user_page_adapter.dump_json(dict(page, items=[_user_out_dict(row) for row in page["items"]]))
+
+
+def _run(fn, pages: list) -> dict:
+    samples = []
+    start = time.perf_counter()
+    for page in pages:
+        t = time.perf_counter()
+        fn(page)
+        samples.append(time.perf_counter() - t)
+    return summarize(samples, time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--page-size", type=int, default=USERS_PAGE_MAX)
+    parser.add_argument("--output", default="bench_serialization.json")
+    args = parser.parse_args()
+
+    results = {}
+    for count in args.users:
+        entities, rows = _make_users(count)
+        entity_pages = list(_pages(entities, args.page_size))
+        row_pages = list(_pages(rows, args.page_size))
+
+        # The fast path must produce the same document
+        assert json.loads(orm_jsonable(entity_pages[0])) == json.loads(rows_type_adapter(row_pages[0]))
+
+        results[f"{count}_users"] = {
+            "orm_jsonable": _run(orm_jsonable, entity_pages),
+            "orm_orjson": _run(orm_orjson, entity_pages),
+            "rows_type_adapter": _run(rows_type_adapter, row_pages),
+        }
+
+    for size, paths in results.items():
+        for name, summary in paths.items():
+            print(f"{size:>14} {name:>18}: {summary}")
+    write_results(args.output, "serialization", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Signup throughput against the real app and a local database.
+
+Run it on two commits and compare the JSON outputs. Password hashing is
+part of every signup, so HASH_POOL_SIZE bounds the achievable rate.
+
+    python -m benchmarks.bench_signup --signups 500 --concurrency 20 --output bench_signup.json
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+from benchmarks import _env  # noqa: F401
+
+# Only the signup transaction is measured, not SMTP delivery
+os.environ.setdefault("EMAIL_OUTBOX_ENABLED", "false")
+
+import httpx
+
+from app.core.config import settings
+from app.schemas.user import UserCreate
+from benchmarks._stats import summarize, write_results
+
+
+def _payload() -> dict:
+    return UserCreate(
+        name="Bench User",
+        email=f"signup-{uuid.uuid4().hex[:12]}@example.com",
+        phone=f"+1{uuid.uuid4().int % 10**10:010d}",
+        password="Bench#Pass1",
+    ).model_dump()
+
+
+async def main_async(args) -> dict:
+    from app.main import app
+
+    url = f"{settings.API_V1_PREFIX}/auth/signup"
+    samples = {"new": [], "duplicate": []}
+    errors = {"new": 0, "duplicate": 0}
+    semaphore = asyncio.Semaphore(args.concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async def signup(client, kind: str, payload: dict, expected: int):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(url, json=payload)
+            if response.status_code == expected:
+                samples[kind].append(time.perf_counter() - start)
+            else:
+                errors[kind] += 1
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            payloads = [_payload() for _ in range(args.signups)]
+
+            start = time.perf_counter()
+            await asyncio.gather(*(signup(client, "new", p, 201) for p in payloads))
+            new_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            await asyncio.gather(*(signup(client, "duplicate", p, 409) for p in payloads))
+            duplicate_elapsed = time.perf_counter() - start
+
+    return {
+        "new": summarize(samples["new"], new_elapsed, errors["new"]),
+        "duplicate": summarize(samples["duplicate"], duplicate_elapsed, errors["duplicate"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Signup throughput benchmark")
+    parser.add_argument("--signups", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--output", default="bench_signup.json")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    for name, summary in results.items():
+        print(f"{name:>10}: {summary}")
+    write_results(args.output, "signup", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
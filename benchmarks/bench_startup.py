@@ -0,0 +1,53 @@
+"""
+Cold-start benchmark: fresh interpreters importing app.main, then running
+the lifespan startup (pool prewarm, background tasks).
+
+    python -m benchmarks.bench_startup --runs 10 --output bench_startup.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks._stats import summarize, write_results
+
+CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+from benchmarks import _env
+from app.main import app
+imported = time.perf_counter()
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+ready = asyncio.run(boot())
+print(json.dumps({"import": imported - start, "ready": ready - start}))
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", default="bench_startup.json")
+    args = parser.parse_args()
+
+    imports, readies = [], []
+    for _ in range(args.runs):
+        out = subprocess.check_output([sys.executable, "-c", CHILD], text=True)
+        timings = json.loads(out.strip().splitlines()[-1])
+        imports.append(timings["import"])
+        readies.append(timings["ready"])
+
+    results = {
+        "import_app": summarize(imports, sum(imports)),
+        "import_and_lifespan": summarize(readies, sum(readies)),
+    }
+    for name, summary in results.items():
+        print(f"{name:>20}: {summary}")
+    write_results(args.output, "startup", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
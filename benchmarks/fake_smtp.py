@@ -0,0 +1,44 @@
+"""
+Local SMTP stand-in that keeps the last OTP sent to each address.
+"""
+import asyncio
+import re
+from email import message_from_bytes
+from typing import Optional
+
+from aiosmtpd.controller import Controller
+
+OTP_PATTERN = re.compile(r"<h1>(\d{6})</h1>")
+
+
+class OTPInbox:
+    def __init__(self):
+        self.otps: dict[str, str] = {}
+        self.messages = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        message = message_from_bytes(envelope.content)
+        for part in message.walk():
+            if part.get_content_type() == "text/html":
+                match = OTP_PATTERN.search(part.get_payload(decode=True).decode())
+                if match:
+                    for rcpt in envelope.rcpt_tos:
+                        self.otps[rcpt.lower()] = match.group(1)
+        return "250 Message accepted for delivery"
+
+    async def wait_for_otp(self, email: str, timeout: float = 30) -> Optional[str]:
+        deadline = asyncio.get_running_loop().time() + timeout
+        while asyncio.get_running_loop().time() < deadline:
+            otp = self.otps.pop(email.lower(), None)
+            if otp:
+                return otp
+            await asyncio.sleep(0.02)
+        return None
+
+
+def start_fake_smtp(host: str, port: int) -> tuple[Controller, OTPInbox]:
+    inbox = OTPInbox()
+    controller = Controller(inbox, hostname=host, port=port)
+    controller.start()
+    return controller, inbox
@@ -0,0 +1,124 @@
+"""
+Load test for the auth flows against the real app, a local database and a
+fake SMTP server.
+
+Each virtual user runs signup -> verify-otp -> login -> /users/me ->
+silent refresh -> logout. The app runs in-process through httpx's ASGI
+transport (with its lifespan, so the email outbox dispatcher is live).
+
+    python -m benchmarks.load_auth_flow --users 200 --concurrency 20 --output bench_output.json
+
+DATABASE_URL must point at a migrated, disposable database.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from collections import defaultdict
+
+from benchmarks import _env  # noqa: F401
+
+import httpx
+
+from app.core.config import settings
+from benchmarks._stats import summarize, write_results
+from benchmarks.fake_smtp import start_fake_smtp
+
+PASSWORD = "Bench#Pass1"
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def call(self, name: str, request, expected: int = 200) -> httpx.Response:
+        start = time.perf_counter()
+        response = await request
+        elapsed = time.perf_counter() - start
+        if response.status_code == expected:
+            self.samples[name].append(elapsed)
+        else:
+            self.errors[name] += 1
+        return response
+
+
+async def run_user(app, inbox, recorder: Recorder) -> None:
+    prefix = settings.API_V1_PREFIX
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    phone = f"+1{uuid.uuid4().int % 10**10:010d}"
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await recorder.call("signup", client.post(f"{prefix}/auth/signup", json={
+            "name": "Bench User",
+            "email": email,
+            "phone": phone,
+            "password": PASSWORD,
+        }), expected=201)
+
+        otp = await inbox.wait_for_otp(email)
+        if otp is None:
+            recorder.errors["otp_delivery"] += 1
+            return
+
+        await recorder.call("verify_otp", client.post(f"{prefix}/auth/verify-otp", json={
+            "email": email,
+            "otp": otp,
+        }))
+        await recorder.call("login", client.post(f"{prefix}/auth/login", json={
+            "email": email,
+            "password": PASSWORD,
+        }))
+        await recorder.call("users_me", client.get(f"{prefix}/users/me"))
+
+        client.cookies.delete(settings.ACCESS_TOKEN_COOKIE_NAME)
+        await recorder.call("silent_refresh", client.get(f"{prefix}/users/me"))
+
+        await recorder.call("logout", client.post(f"{prefix}/auth/logout"))
+
+
+async def main_async(args) -> dict:
+    controller, inbox = start_fake_smtp(settings.SMTP_HOST, settings.SMTP_PORT)
+
+    from app.main import app
+
+    recorder = Recorder()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited():
+        async with semaphore:
+            await run_user(app, inbox, recorder)
+
+    try:
+        async with app.router.lifespan_context(app):
+            start = time.perf_counter()
+            await asyncio.gather(*(limited() for _ in range(args.users)))
+            elapsed = time.perf_counter() - start
+    finally:
+        controller.stop()
+
+    results = {
+        name: summarize(recorder.samples[name], elapsed, recorder.errors[name])
+        for name in ("signup", "verify_otp", "login", "users_me", "silent_refresh", "logout")
+    }
+    results["otp_delivery_errors"] = recorder.errors["otp_delivery"]
+    results["total_seconds"] = round(elapsed, 3)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--output", default="bench_output.json")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    for name, summary in results.items():
+        print(f"{name:>20}: {summary}")
+    write_results(args.output, "auth_flow", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.user import BulkStatusUpdate
+
+
+def test_requires_exactly_one_target():
+    with pytest.raises(ValidationError):
+        BulkStatusUpdate(is_active=False)
+    with pytest.raises(ValidationError):
+        BulkStatusUpdate(is_active=False, user_ids=[uuid.uuid4()], filter={"role": "user"})
+
+
+@pytest.mark.parametrize("filter", [{}, {"role": None, "is_verified": None}])
+def test_rejects_empty_filter(filter):
+    with pytest.raises(ValidationError):
+        BulkStatusUpdate(is_active=False, filter=filter)
+
+
+@pytest.mark.parametrize("filter", [{"role": "user"}, {"is_verified": False}])
+def test_accepts_narrowing_filter(filter):
+    assert BulkStatusUpdate(is_active=False, filter=filter).filter is not None
+
+
+def test_accepts_user_ids():
+    ids = [uuid.uuid4(), uuid.uuid4()]
+    assert BulkStatusUpdate(is_active=True, user_ids=ids).user_ids == ids
@@ -0,0 +1,45 @@
+import pytest
+from starlette.requests import Request
+
+from app.core import rate_limit
+from app.core.rate_limit import client_ip
+
+
+def _request(peer: str, forwarded_for: str = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "client": (peer, 1234), "headers": headers})
+
+
+@pytest.fixture
+def trusted(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_trusted_proxies", [
+        rate_limit.ipaddress.ip_network("10.0.0.0/8"),
+        rate_limit.ipaddress.ip_network("192.168.1.5/32"),
+    ])
+
+
+def test_header_ignored_without_trusted_proxies():
+    assert client_ip(_request("203.0.113.9", "198.51.100.1")) == "203.0.113.9"
+
+
+def test_header_ignored_from_untrusted_peer(trusted):
+    assert client_ip(_request("203.0.113.9", "198.51.100.1")) == "203.0.113.9"
+
+
+def test_client_behind_trusted_proxy(trusted):
+    assert client_ip(_request("10.0.0.2", "198.51.100.1")) == "198.51.100.1"
+
+
+def test_skips_chained_trusted_proxies_and_spoofed_entries(trusted):
+    # The client prepended a fake address; only the hop appended by our
+    # outermost proxy counts
+    request = _request("10.0.0.2", "1.2.3.4, 198.51.100.1, 192.168.1.5")
+    assert client_ip(request) == "198.51.100.1"
+
+
+def test_all_hops_trusted_falls_back_to_leftmost(trusted):
+    assert client_ip(_request("10.0.0.2", "10.1.1.1, 10.2.2.2")) == "10.1.1.1"
+
+
+def test_trusted_peer_without_header(trusted):
+    assert client_ip(_request("10.0.0.2")) == "10.0.0.2"
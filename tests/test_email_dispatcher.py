@@ -0,0 +1,115 @@
+import uuid
+
+import pytest
+
+from app.models.email_outbox import EmailOutbox, EmailStatus
+from app.services import email_dispatcher as dispatcher_module
+from app.services.email_dispatcher import EmailOutboxDispatcher
+
+pytestmark = pytest.mark.anyio
+
+
+class _Result:
+    def __init__(self, rowcount):
+        self.rowcount = rowcount
+
+
+class _FakeSessions:
+    """
+    Stands in for AsyncSessionLocal; every UPDATE matches `matches` rows.
+    """
+
+    def __init__(self, renew_matches=1, finish_matches=1):
+        self.renew_matches = renew_matches
+        self.finish_matches = finish_matches
+        self.statements = []
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        params = statement.compile().params
+        return _Result(self.renew_matches if "status" not in params else self.finish_matches)
+
+    async def commit(self):
+        pass
+
+
+class _FakePool:
+    def __init__(self, error=None):
+        self.error = error
+        self.sent = []
+
+    def send(self, to_email, message):
+        if self.error is not None:
+            raise self.error
+        self.sent.append(to_email)
+
+    def close(self):
+        pass
+
+
+def _claimed_row(attempts=1) -> EmailOutbox:
+    return EmailOutbox(
+        id=uuid.uuid4(),
+        to_email="user@example.com",
+        subject="Verify your email",
+        html_content="<p>123456</p>",
+        status=EmailStatus.sending,
+        attempts=attempts
+    )
+
+
+def _dispatcher(monkeypatch, sessions, pool, row) -> EmailOutboxDispatcher:
+    monkeypatch.setattr(dispatcher_module, "AsyncSessionLocal", sessions)
+    dispatcher = EmailOutboxDispatcher(pool=pool)
+
+    async def claim_batch():
+        return [row]
+
+    monkeypatch.setattr(dispatcher, "_claim_batch", claim_batch)
+    return dispatcher
+
+
+async def test_sent_row_is_marked_while_claim_holds(monkeypatch):
+    sessions, pool, row = _FakeSessions(), _FakePool(), _claimed_row(attempts=3)
+    await _dispatcher(monkeypatch, sessions, pool, row).dispatch_once()
+
+    assert pool.sent == ["user@example.com"]
+    renew, finish = sessions.statements
+    params = finish.compile().params
+    assert params["status"] == EmailStatus.sent
+    # Only the claim this worker made is updated
+    assert params["attempts_1"] == 3
+    assert params["status_1"] == EmailStatus.sending
+    assert renew.compile().params["attempts_1"] == 3
+
+
+async def test_reclaimed_row_is_not_sent(monkeypatch):
+    sessions, pool, row = _FakeSessions(renew_matches=0), _FakePool(), _claimed_row()
+    await _dispatcher(monkeypatch, sessions, pool, row).dispatch_once()
+
+    assert pool.sent == []
+    assert len(sessions.statements) == 1
+
+
+async def test_failed_send_backs_off(monkeypatch):
+    sessions, pool, row = _FakeSessions(), _FakePool(error=OSError("refused")), _claimed_row(attempts=2)
+    await _dispatcher(monkeypatch, sessions, pool, row).dispatch_once()
+
+    params = sessions.statements[-1].compile().params
+    assert params["status"] == EmailStatus.pending
+    assert params["last_error"] == "refused"
+    assert params["next_attempt_at"] is not None
+
+
+async def test_lost_claim_at_finish_is_skipped(monkeypatch):
+    sessions, pool, row = _FakeSessions(finish_matches=0), _FakePool(), _claimed_row()
+    assert await _dispatcher(monkeypatch, sessions, pool, row).dispatch_once() == 1
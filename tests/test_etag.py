@@ -0,0 +1,99 @@
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.core.profile_cache import profile_cache
+from app.core.replicas import get_read_db
+from app.dependencies.auth import user_required
+from app.main import app
+from app.services import user_service
+from app.utils.etag import if_none_match, make_etag
+
+UserRow = namedtuple("UserRow", "id name email role is_active is_verified updated_at")
+
+USER_ID = uuid.uuid4()
+
+
+def _request(header: str) -> Request:
+    return Request({"type": "http", "headers": [(b"if-none-match", header.encode())]})
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = make_etag("a", weak=True)
+
+    assert if_none_match(_request(etag.removeprefix("W/")), etag)
+    assert if_none_match(_request(f'"other", {etag}'), etag)
+    assert if_none_match(_request("*"), etag)
+    assert not if_none_match(_request('"other"'), etag)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    row = {"user": UserRow(USER_ID, "Test", "t@example.com", "user", True, True, datetime(2025, 1, 1))}
+    loads = []
+
+    async def fake_get_my_profile(db, user_id):
+        loads.append(user_id)
+        return row["user"]
+
+    async def no_db():
+        yield None
+
+    monkeypatch.setattr(user_service, "get_my_profile", fake_get_my_profile)
+    app.dependency_overrides[user_required] = lambda: {"sub": str(USER_ID), "role": "user"}
+    app.dependency_overrides[get_read_db] = no_db
+    profile_cache.clear()
+    try:
+        yield TestClient(app), row, loads
+    finally:
+        app.dependency_overrides.clear()
+        profile_cache.clear()
+
+
+def test_me_returns_304_for_matching_etag(client):
+    http, _, loads = client
+
+    first = http.get("/api/v1/users/me")
+    assert first.status_code == 200
+    assert first.json()["email"] == "t@example.com"
+
+    second = http.get("/api/v1/users/me", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 304
+    assert second.content == b""
+    # Answered from the profile cache
+    assert len(loads) == 1
+
+
+def test_me_304_on_cache_miss_without_serializing(client, monkeypatch):
+    http, _, loads = client
+    etag = http.get("/api/v1/users/me").headers["etag"]
+    profile_cache.clear()
+
+    def fail(*args):
+        raise AssertionError("serialized a 304")
+
+    monkeypatch.setattr(user_service.user_out_adapter, "dump_json", fail)
+    response = http.get("/api/v1/users/me", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert len(loads) == 2
+
+
+def test_me_changed_row_gets_new_etag(client):
+    http, row, _ = client
+    etag = http.get("/api/v1/users/me").headers["etag"]
+
+    row["user"] = row["user"]._replace(
+        name="Renamed",
+        updated_at=row["user"].updated_at + timedelta(seconds=1)
+    )
+    profile_cache.invalidate(USER_ID)
+    response = http.get("/api/v1/users/me", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
+    assert response.headers["etag"] != etag
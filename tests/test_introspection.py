@@ -0,0 +1,74 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.security import create_access_token, create_refresh_token, hash_token
+from app.dependencies.auth import introspection_client
+from app.services.auth_service import introspect_tokens
+
+pytestmark = pytest.mark.anyio
+
+
+class _Result:
+    def __init__(self, values):
+        self._values = values
+
+    def scalars(self):
+        return iter(self._values)
+
+
+class _FakeSession:
+    def __init__(self, live_hashes):
+        self.live_hashes = live_hashes
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return _Result(self.live_hashes)
+
+
+async def test_refresh_tokens_checked_in_one_query():
+    sub = str(uuid.uuid4())
+    access = create_access_token({"sub": sub, "role": "user"})
+    live = create_refresh_token({"sub": sub})
+    revoked = create_refresh_token({"sub": sub})
+    db = _FakeSession([hash_token(live)])
+
+    response = await introspect_tokens(db, [access, live, revoked, "not-a-jwt"])
+
+    assert len(db.statements) == 1
+    results = response["results"]
+    assert [r["active"] for r in results] == [True, True, False, False]
+    assert results[0]["token_type"] == "access"
+    assert results[0]["claims"]["sub"] == sub
+    assert results[1]["token_type"] == "refresh"
+
+
+async def test_no_query_without_refresh_tokens():
+    db = _FakeSession([])
+    access = create_access_token({"sub": str(uuid.uuid4()), "role": "admin"})
+
+    response = await introspect_tokens(db, [access, "garbage"])
+
+    assert db.statements == []
+    assert [r["active"] for r in response["results"]] == [True, False]
+
+
+def _request(authorization: str) -> Request:
+    return Request({"type": "http", "headers": [(b"authorization", authorization.encode("latin-1"))]})
+
+
+@pytest.mark.parametrize("authorization", ["Bearer wrong-key", "Bearer cl\xe9", "Basic gateway-key"])
+async def test_introspection_client_rejects_bad_keys(monkeypatch, authorization):
+    monkeypatch.setattr(settings, "INTROSPECTION_API_KEY", "gateway-key")
+    with pytest.raises(HTTPException) as exc:
+        introspection_client(_request(authorization))
+    assert exc.value.status_code == 401
+
+
+async def test_introspection_client_accepts_key(monkeypatch):
+    monkeypatch.setattr(settings, "INTROSPECTION_API_KEY", "gateway-key")
+    introspection_client(_request("Bearer gateway-key"))
@@ -0,0 +1,102 @@
+import os
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from jose import JWTError, jwt
+
+from app.core import security
+from app.core.config import settings
+from app.core.keyring import KeyRing, _generate
+
+ALGORITHM = "ES256"
+CLAIMS = {"sub": "user-1", "role": "user"}
+
+
+def _retire(keys_dir, kid: str) -> None:
+    """
+    Replace a private key with its public half, as after a rotation.
+    """
+    private_path = os.path.join(keys_dir, f"{kid}.pem")
+    with open(private_path, "rb") as f:
+        private_key = serialization.load_pem_private_key(f.read(), password=None)
+    with open(os.path.join(keys_dir, f"{kid}.pub.pem"), "wb") as f:
+        f.write(private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        ))
+    os.remove(private_path)
+
+
+@pytest.fixture
+def keys_dir(tmp_path):
+    _generate("old", str(tmp_path), ALGORITHM)
+    _generate("new", str(tmp_path), ALGORITHM)
+    return tmp_path
+
+
+def test_signs_with_active_kid(keys_dir):
+    ring = KeyRing(str(keys_dir), "new", ALGORITHM)
+    token = ring.sign(CLAIMS)
+
+    assert jwt.get_unverified_header(token)["kid"] == "new"
+    assert ring.decode(token) == CLAIMS
+    assert {key["kid"] for key in ring.jwks["keys"]} == {"old", "new"}
+
+
+def test_verifies_tokens_from_retired_kid(keys_dir):
+    old_token = KeyRing(str(keys_dir), "old", ALGORITHM).sign(CLAIMS)
+    _retire(keys_dir, "old")
+
+    ring = KeyRing(str(keys_dir), "new", ALGORITHM)
+    assert ring.decode(old_token) == CLAIMS
+    with pytest.raises(RuntimeError):
+        KeyRing(str(keys_dir), "old", ALGORITHM)
+
+
+def test_rejects_unknown_kid(keys_dir, tmp_path_factory):
+    other_dir = tmp_path_factory.mktemp("other")
+    _generate("other", str(other_dir), ALGORITHM)
+    token = KeyRing(str(other_dir), "other", ALGORITHM).sign(CLAIMS)
+
+    with pytest.raises(JWTError):
+        KeyRing(str(keys_dir), "new", ALGORITHM).decode(token)
+
+
+def test_rejects_kid_with_wrong_key(keys_dir, tmp_path_factory):
+    other_dir = tmp_path_factory.mktemp("other")
+    _generate("new", str(other_dir), ALGORITHM)
+    forged = KeyRing(str(other_dir), "new", ALGORITHM).sign(CLAIMS)
+
+    with pytest.raises(JWTError):
+        KeyRing(str(keys_dir), "new", ALGORITHM).decode(forged)
+
+
+@pytest.fixture
+def configured_ring(keys_dir, monkeypatch):
+    ring = KeyRing(str(keys_dir), "new", ALGORITHM)
+    monkeypatch.setattr(security, "get_keyring", lambda: ring)
+    return ring
+
+
+def _legacy_token() -> str:
+    return jwt.encode(CLAIMS, settings.ACCESS_TOKEN_SECRET_KEY, algorithm=settings.ACCESS_TOKEN_ALGORITHM)
+
+
+def test_access_tokens_round_trip_through_keyring(configured_ring):
+    token = security.create_access_token(CLAIMS)
+
+    assert jwt.get_unverified_header(token)["kid"] == "new"
+    assert security.decode_access_token(token)["sub"] == "user-1"
+
+
+def test_legacy_hmac_rejected_by_default(configured_ring, monkeypatch):
+    monkeypatch.setattr(settings, "JWT_ACCEPT_LEGACY_HMAC", False)
+
+    with pytest.raises(JWTError):
+        security.decode_access_token(_legacy_token())
+
+
+def test_legacy_hmac_accepted_during_switch_over(configured_ring, monkeypatch):
+    monkeypatch.setattr(settings, "JWT_ACCEPT_LEGACY_HMAC", True)
+
+    assert security.decode_access_token(_legacy_token()) == CLAIMS
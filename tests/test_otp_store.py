@@ -0,0 +1,72 @@
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.auth import OTPSchema
+from app.services.otp_store import MemoryOTPStore, OTPCheck
+
+pytestmark = pytest.mark.anyio
+
+EMAIL = "pending@example.com"
+
+
+async def test_valid_code_is_consumed():
+    store = MemoryOTPStore()
+    await store.put(EMAIL, "123456", ttl_seconds=60)
+
+    assert await store.verify(EMAIL, "123456", max_attempts=3) is OTPCheck.valid
+    assert await store.verify(EMAIL, "123456", max_attempts=3) is OTPCheck.missing
+
+
+async def test_non_ascii_code_is_rejected():
+    store = MemoryOTPStore()
+    await store.put(EMAIL, "123456", ttl_seconds=60)
+
+    assert await store.verify(EMAIL, "12345\u0665", max_attempts=3) is OTPCheck.invalid
+
+
+@pytest.mark.parametrize("otp", ["12345", "1234567", "12345a", "12345\u0665"])
+async def test_schema_requires_six_ascii_digits(otp):
+    with pytest.raises(ValidationError):
+        OTPSchema(email=EMAIL, otp=otp)
+
+
+async def test_unknown_email_is_missing():
+    assert await MemoryOTPStore().verify(EMAIL, "123456", max_attempts=3) is OTPCheck.missing
+
+
+async def test_expired_code_is_missing():
+    store = MemoryOTPStore()
+    await store.put(EMAIL, "123456", ttl_seconds=0)
+
+    assert await store.verify(EMAIL, "123456", max_attempts=3) is OTPCheck.missing
+
+
+async def test_locks_after_max_attempts():
+    store = MemoryOTPStore()
+    await store.put(EMAIL, "123456", ttl_seconds=60)
+
+    assert await store.verify(EMAIL, "000000", max_attempts=3) is OTPCheck.invalid
+    assert await store.verify(EMAIL, "000000", max_attempts=3) is OTPCheck.invalid
+    assert await store.verify(EMAIL, "000000", max_attempts=3) is OTPCheck.locked
+    # The code is gone, even the right one no longer verifies
+    assert await store.verify(EMAIL, "123456", max_attempts=3) is OTPCheck.missing
+
+
+async def test_put_replaces_code_and_resets_attempts():
+    store = MemoryOTPStore()
+    await store.put(EMAIL, "123456", ttl_seconds=60)
+    await store.verify(EMAIL, "000000", max_attempts=2)
+    assert await store.verify(EMAIL, "000000", max_attempts=2) is OTPCheck.locked
+
+    # What /auth/resend-otp does after a lockout
+    await store.put(EMAIL, "654321", ttl_seconds=60)
+    assert await store.verify(EMAIL, "000000", max_attempts=2) is OTPCheck.invalid
+    assert await store.verify(EMAIL, "654321", max_attempts=2) is OTPCheck.valid
+
+
+async def test_purge_expired():
+    store = MemoryOTPStore()
+    await store.put(EMAIL, "123456", ttl_seconds=0)
+    await store.put("other@example.com", "123456", ttl_seconds=60)
+
+    assert await store.purge_expired() == 1
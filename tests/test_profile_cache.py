@@ -0,0 +1,87 @@
+import time
+import uuid
+
+from app.core.profile_cache import ProfileCache
+
+PROFILE = (b'{"name":"old"}', '"v1"')
+NEW_PROFILE = (b'{"name":"new"}', '"v2"')
+
+
+def _cache(**kwargs) -> ProfileCache:
+    return ProfileCache(**{"maxsize": 10, "ttl": 60, "primary_window": 5, **kwargs})
+
+
+def test_miss_then_hit():
+    cache = _cache()
+    user_id = uuid.uuid4()
+
+    profile, fill = cache.get(user_id)
+    assert profile is None
+    assert not fill.use_primary
+    cache.put(user_id, PROFILE, fill)
+
+    assert cache.get(user_id)[0] == PROFILE
+
+
+def test_invalidate_drops_entry_and_routes_next_fill_to_primary():
+    cache = _cache()
+    user_id = uuid.uuid4()
+    cache.put(user_id, PROFILE, cache.get(user_id)[1])
+
+    cache.invalidate(user_id)
+    profile, fill = cache.get(user_id)
+
+    assert profile is None
+    assert fill.use_primary
+    cache.put(user_id, NEW_PROFILE, fill)
+    assert cache.get(user_id)[0] == NEW_PROFILE
+
+
+def test_fill_started_before_invalidation_is_not_stored():
+    cache = _cache()
+    user_id = uuid.uuid4()
+
+    _, fill = cache.get(user_id)
+    cache.invalidate(user_id)
+    cache.put(user_id, PROFILE, fill)
+
+    assert cache.get(user_id)[0] is None
+
+
+def test_invalidation_only_affects_its_own_key():
+    cache = _cache()
+    user_id, other_id = uuid.uuid4(), uuid.uuid4()
+
+    _, fill = cache.get(user_id)
+    cache.invalidate(other_id)
+    cache.put(user_id, PROFILE, fill)
+
+    assert cache.get(user_id)[0] == PROFILE
+
+
+def test_primary_window_expires():
+    cache = _cache(primary_window=0.01)
+    user_id = uuid.uuid4()
+
+    cache.invalidate(user_id)
+    time.sleep(0.02)
+
+    assert not cache.get(user_id)[1].use_primary
+
+
+def test_entries_expire_after_ttl():
+    cache = _cache(ttl=0)
+    user_id = uuid.uuid4()
+    cache.put(user_id, PROFILE, cache.get(user_id)[1])
+
+    assert cache.get(user_id)[0] is None
+
+
+def test_bounded_by_maxsize():
+    cache = _cache(maxsize=2)
+    ids = [uuid.uuid4() for _ in range(3)]
+    for user_id in ids:
+        cache.put(user_id, PROFILE, cache.get(user_id)[1])
+
+    assert cache.get(ids[0])[0] is None
+    assert cache.get(ids[2])[0] == PROFILE
@@ -0,0 +1,71 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import replicas
+from app.core.config import settings
+from app.core.replicas import ReplicaRouter
+
+pytestmark = pytest.mark.anyio
+
+
+class _FakeSession:
+    def __init__(self, connect_error=None):
+        self.connect_error = connect_error
+        self.closed = False
+
+    async def connection(self):
+        if self.connect_error is not None:
+            raise self.connect_error
+
+    async def close(self):
+        self.closed = True
+
+
+def _replica(host: str, session=None):
+    return SimpleNamespace(
+        healthy=True,
+        engine=SimpleNamespace(url=SimpleNamespace(host=host)),
+        sessionmaker=lambda: session
+    )
+
+
+def _router(*fake_replicas) -> ReplicaRouter:
+    router = ReplicaRouter([])
+    router.replicas = list(fake_replicas)
+    return router
+
+
+async def test_hung_replica_is_marked_down_without_blocking_others(monkeypatch):
+    monkeypatch.setattr(settings, "REPLICA_CONNECT_TIMEOUT_SECONDS", 0.05)
+    hung, lagging, current = _replica("hung"), _replica("lagging"), _replica("current")
+    router = _router(hung, lagging, current)
+
+    async def lag(replica):
+        if replica is hung:
+            await asyncio.sleep(10)
+        return settings.REPLICA_MAX_LAG_SECONDS + 1 if replica is lagging else 0
+
+    monkeypatch.setattr(router, "_lag", lag)
+    await asyncio.wait_for(router.check(), 1)
+
+    assert [r.healthy for r in (hung, lagging, current)] == [False, False, True]
+
+
+async def test_session_falls_back_to_primary_when_replica_unreachable(monkeypatch):
+    primary = _FakeSession()
+    monkeypatch.setattr(replicas, "AsyncSessionLocal", lambda: primary)
+    replica_session = _FakeSession(connect_error=OSError("connection refused"))
+    replica = _replica("down", replica_session)
+
+    assert await _router(replica).session() is primary
+    assert replica_session.closed
+    assert not replica.healthy
+
+
+async def test_session_uses_connected_replica(monkeypatch):
+    monkeypatch.setattr(replicas, "AsyncSessionLocal", lambda: pytest.fail("primary used"))
+    replica_session = _FakeSession()
+
+    assert await _router(_replica("up", replica_session)).session() is replica_session
@@ -0,0 +1,82 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from app.models.email_outbox import EmailOutbox
+from app.models.user import User
+from app.schemas.user import UserCreate
+from app.services import auth_service
+from app.services.otp_service import check_otp
+from app.services.otp_store import OTPCheck
+
+pytestmark = pytest.mark.anyio
+
+
+class _FakeSession:
+    def __init__(self, commit_error=None):
+        self.commit_error = commit_error
+        self.added = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def commit(self):
+        self.commits += 1
+        if self.commit_error is not None:
+            raise self.commit_error
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture(autouse=True)
+def fast_hash(monkeypatch):
+    async def hash_password_async(password):
+        return "hashed"
+
+    monkeypatch.setattr(auth_service, "hash_password_async", hash_password_async)
+    monkeypatch.setattr(auth_service, "generate_otp", lambda: "123456")
+
+
+def _data(email: str) -> UserCreate:
+    return UserCreate(name="Test User", email=email, phone="+15551234567", password="Str0ng#Pass")
+
+
+def _unique_violation(index: str) -> IntegrityError:
+    return IntegrityError("INSERT INTO users ...", {}, Exception(f'duplicate key value violates unique constraint "{index}"'))
+
+
+async def test_signup_writes_user_and_email_in_one_commit():
+    db = _FakeSession()
+
+    await auth_service.signup(db, _data("new@example.com"))
+
+    assert db.commits == 1
+    assert [type(obj) for obj in db.added] == [User, EmailOutbox]
+    assert await check_otp("new@example.com", "123456") is OTPCheck.valid
+
+
+@pytest.mark.parametrize("index, field", [("ix_users_email", "Email"), ("ix_users_phone", "Phone")])
+async def test_duplicate_detected_by_unique_index(index, field):
+    db = _FakeSession(commit_error=_unique_violation(index))
+
+    with pytest.raises(HTTPException) as error:
+        await auth_service.signup(db, _data("taken@example.com"))
+
+    assert error.value.status_code == 409
+    assert error.value.detail == f"{field} already exists"
+    assert db.rollbacks == 1
+
+
+async def test_other_integrity_errors_are_not_reported_as_duplicates():
+    error = IntegrityError(
+        "INSERT INTO users ...", {}, Exception('null value in column "name" violates not-null constraint')
+    )
+    db = _FakeSession(commit_error=error)
+
+    with pytest.raises(IntegrityError):
+        await auth_service.signup(db, _data("new@example.com"))
+
+    assert db.rollbacks == 1
@@ -0,0 +1,54 @@
+import asyncio
+import uuid
+
+import pytest
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.security import create_refresh_token
+from app.dependencies import auth
+
+pytestmark = pytest.mark.anyio
+
+
+class _Result:
+    def scalar_one_or_none(self):
+        return uuid.uuid4()
+
+
+class _SlowSession:
+    opened = 0
+
+    async def __aenter__(self):
+        _SlowSession.opened += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        await asyncio.sleep(0.05)
+        return _Result()
+
+
+def _request(refresh_token: str) -> Request:
+    cookie = f"{settings.REFRESH_TOKEN_COOKIE_NAME}={refresh_token}".encode()
+    return Request({"type": "http", "headers": [(b"cookie", cookie)]})
+
+
+async def test_coalesced_refresh_survives_first_caller_cancellation(monkeypatch):
+    monkeypatch.setattr(auth, "AsyncSessionLocal", _SlowSession)
+    _SlowSession.opened = 0
+    refresh_token = create_refresh_token({"sub": str(uuid.uuid4()), "role": "user"})
+
+    first = asyncio.ensure_future(auth.get_current_user(_request(refresh_token)))
+    await asyncio.sleep(0)
+    second_request = _request(refresh_token)
+    second = asyncio.ensure_future(auth.get_current_user(second_request))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    payload = await second
+    assert payload["role"] == "user"
+    assert second_request.state.new_access_token
+    assert _SlowSession.opened == 1
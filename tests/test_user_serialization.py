@@ -0,0 +1,58 @@
+import json
+import uuid
+from collections import namedtuple
+
+import pytest
+
+from app.models.user import Role
+from app.schemas.user import UserOut, UserOutRow, UserPage, user_out_adapter, user_page_adapter
+from app.services.user_service import USER_OUT_FIELDS, _user_out_dict
+
+# What `select(*USER_OUT_COLUMNS, User.created_at)` returns
+Row = namedtuple("Row", USER_OUT_FIELDS + ("created_at",))
+
+
+def _row(**overrides) -> Row:
+    values = {
+        "id": uuid.uuid4(),
+        "name": "Zoë O'Brien ☃",
+        "email": "zoe@example.com",
+        "role": Role.admin,
+        "is_active": True,
+        "is_verified": False,
+        "created_at": None,
+        **overrides,
+    }
+    return Row(**values)
+
+
+def test_row_shape_matches_user_out():
+    assert tuple(UserOutRow.__annotations__) == tuple(UserOut.model_fields)
+    assert USER_OUT_FIELDS == tuple(UserOut.model_fields)
+
+
+@pytest.mark.parametrize("role", list(Role))
+def test_profile_json_matches_user_out(role):
+    row = _row(role=role)
+
+    fast = user_out_adapter.dump_json(_user_out_dict(row))
+    model = UserOut.model_validate(row, from_attributes=True).model_dump_json().encode()
+
+    assert fast == model
+
+
+def test_page_json_matches_user_page():
+    rows = [_row(), _row(role=Role.user, is_active=False, is_verified=True)]
+    page = {"items": [_user_out_dict(row) for row in rows], "next_cursor": "abc", "estimated_total": 2}
+
+    fast = user_page_adapter.dump_json(page)
+    model = UserPage.model_validate(
+        {**page, "items": rows}, from_attributes=True
+    ).model_dump_json().encode()
+
+    assert json.loads(fast) == json.loads(model)
+    assert fast == model
+
+
+def test_extra_columns_are_not_serialized():
+    assert "created_at" not in json.loads(user_out_adapter.dump_json(_user_out_dict(_row())))